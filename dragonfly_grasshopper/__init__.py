@@ -4,4 +4,8 @@ Note that this package is not interned to run with cPython and it only possesses
 the Grasshopper components. In order to run the plugin, the core libraries must
 be installed in a manner that they can be discovered by Rhino.
 The package includes both the userobjects (.ghuser) and the Python source (.py).
+
+The few modules of this package (eg. dragonfly_grasshopper.library) hold the
+helper functions that are shared by several components. They only use the core
+libraries and they run with both IronPython and cPython.
 """
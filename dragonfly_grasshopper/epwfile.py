@@ -0,0 +1,101 @@
+"""Build the columns of values of EPW files and write them as text.
+
+EPW.save formats the value of each field of each hour through the data collections
+of the EPW object and joins the whole file in memory before writing it. The
+epw_columns function gets all of the values of each field at once and the
+write_epw_columns function streams the rows of the file from these columns, which
+gives the same text as EPW.save.
+"""
+import os
+import sys
+import gzip
+
+from ladybug.futil import writemode
+
+from .weather import EPW_FIELD_COUNT
+
+ANNUAL_HOURS = (8760, 8784)  # number of rows in the EPW of a year and a leap year
+
+
+def epw_columns(epw_obj):
+    """Get the header and the columns of values of each field of an EPW object.
+
+    Args:
+        epw_obj: An EPW object. Data in IP units is written in SI units as
+            EPW.save does.
+
+    Returns:
+        A tuple with two elements.
+
+        -   header: Text for the first 8 lines of the EPW file.
+
+        -   columns: A list with a list of text values for each of the 35 fields
+            of the EPW, in the order of the rows of the file. As the EPW starts
+            at 1 AM, the first value of point-in-time fields is moved to the end.
+    """
+    originally_ip = epw_obj.is_ip
+    if originally_ip:
+        epw_obj.convert_to_si()
+    columns = []
+    for field in range(EPW_FIELD_COUNT):
+        data = epw_obj.import_data_by_field(field)
+        col = [str(val) for val in data.values]
+        if data.header.data_type.point_in_time:
+            col = col[1:] + col[:1]
+        columns.append(col)
+    header = ''.join(epw_obj.header)
+    if originally_ip:
+        epw_obj.convert_to_ip()
+    return header, columns
+
+
+def write_epw_columns(file_path, header, columns, compress=False, chunk_size=744):
+    """Write an EPW file from its header and the columns of values of its fields.
+
+    The rows are joined and written one chunk of hours at a time. The file is
+    opened the same way as ladybug's write_to_file such that the line endings are
+    the same as those of EPW.save.
+
+    Args:
+        file_path: The path to the file that will be written.
+        header: Text for the first 8 lines of the EPW file.
+        columns: A list with a list of values for each of the 35 fields of the
+            EPW in the order of the rows of the file, as from epw_columns.
+        compress: Boolean to note whether the file should be compressed with gzip.
+        chunk_size: Integer for the number of rows that are written at a time.
+
+    Returns:
+        The path to the file that was written.
+    """
+    # check that every column has a value for each hour of the year
+    assert len(columns) == EPW_FIELD_COUNT, 'An EPW must have {} columns. ' \
+        'Got {}.'.format(EPW_FIELD_COUNT, len(columns))
+    hours = max(len(col) for col in columns)
+    for field, col in enumerate(columns):
+        if len(col) != hours or hours not in ANNUAL_HOURS:
+            raise ValueError(
+                'Data length is not for a full year and cannot be saved as an EPW '
+                'file.\nField {} has {} values.'.format(field, len(col)))
+
+    folder = os.path.dirname(file_path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    # the gzip file is always binary and gets the line endings of the text mode
+    newline = '\n'
+    if compress:
+        out_file = gzip.open(file_path, 'wb')
+        if 'b' not in writemode:
+            newline = os.linesep
+            header = header.replace('\n', newline)
+    else:
+        out_file = open(file_path, writemode)
+    encode = compress and sys.version_info >= (3, 0)
+    try:
+        out_file.write(header.encode('utf-8') if encode else header)
+        for st in range(0, hours, chunk_size):
+            rows = zip(*[col[st:st + chunk_size] for col in columns])
+            lines = ''.join([','.join(row) + newline for row in rows])
+            out_file.write(lines.encode('utf-8') if encode else lines)
+    finally:
+        out_file.close()
+    return file_path
@@ -0,0 +1,88 @@
+"""Slice closed Polyface3D solids into floor plates without the use of Rhino.
+
+The functions only use ladybug_geometry such that the floors of a building
+massing can be computed (and tested) outside of Rhino.
+"""
+import hashlib
+
+from ladybug_geometry.geometry2d.pointvector import Point2D
+from ladybug_geometry.geometry2d.polygon import Polygon2D
+from ladybug_geometry.geometry3d.pointvector import Point3D
+from ladybug_geometry.geometry3d.plane import Plane
+from ladybug_geometry.geometry3d.polyline import Polyline3D
+from ladybug_geometry.geometry3d.face import Face3D
+
+
+def geometry_key(points, topology):
+    """Get text that changes whenever the points or the topology of a geometry change.
+
+    Args:
+        points: A list of (x, y, z) tuples for points on the geometry.
+        topology: A list of tuples of integers that describe how the parts of
+            the geometry are connected (eg. the vertex indices of each face).
+    """
+    coords = ';'.join('{},{},{}'.format(*pt) for pt in points)
+    return hashlib.md5((coords + str(topology)).encode('utf-8')).hexdigest()
+
+
+def polyface_key(polyface):
+    """Get text that changes whenever the geometry of a Polyface3D changes."""
+    points = [(pt.x, pt.y, pt.z) for pt in polyface.vertices]
+    return geometry_key(points, polyface.face_indices)
+
+
+def polygons_to_faces(polygons, height):
+    """Convert closed polygons of a cross section into horizontal Face3Ds.
+
+    Polygons inside an odd number of the other polygons become holes in the
+    smallest polygon that contains them.
+
+    Args:
+        polygons: A list of Polygon2D for the closed loops of a cross section.
+        height: A number for the Z coordinate of the resulting Face3Ds.
+    """
+    polygons = sorted(polygons, key=lambda pgon: pgon.area, reverse=True)
+    face_holes = {}  # dictionary of boundary polygon indices and their holes
+    for i, pgon in enumerate(polygons):
+        parents = [j for j in range(i) if polygons[j].is_polygon_inside(pgon)]
+        if len(parents) % 2 == 1:  # the polygon is a hole in its smallest parent
+            face_holes[parents[-1]].append(pgon)
+        else:
+            face_holes[i] = []
+
+    plane = Plane(o=Point3D(0, 0, height))
+    faces = []
+    for i in sorted(face_holes):
+        boundary = [Point3D(pt.x, pt.y, height) for pt in polygons[i]]
+        holes = [[Point3D(pt.x, pt.y, height) for pt in hole]
+                 for hole in face_holes[i]]
+        faces.append(Face3D(boundary, plane, holes if len(holes) != 0 else None))
+    return faces
+
+
+def slice_polyface(polyface, floor_heights, tolerance):
+    """Get a list of horizontal Face3Ds for each floor of a Polyface3D solid.
+
+    Each floor is the cross section of the solid a tolerance above the floor
+    height such that faces lying in the plane of the floor are not included.
+
+    Args:
+        polyface: A closed Polyface3D for the building massing.
+        floor_heights: A list of numbers for the heights of the floors.
+        tolerance: The minimum distance at which points are considered equivalent.
+    """
+    floor_faces = []
+    for hgt in floor_heights:
+        plane = Plane(o=Point3D(0, 0, hgt + tolerance))
+        polygons = []
+        for loop in Polyline3D.join_segments(polyface.intersect_plane(plane), tolerance):
+            if not isinstance(loop, Polyline3D) or \
+                    not loop.vertices[0].is_equivalent(loop.vertices[-1], tolerance):
+                continue  # not a closed loop
+            pgon = Polygon2D([Point2D(pt.x, pt.y) for pt in loop.vertices[:-1]])
+            try:
+                polygons.append(pgon.remove_colinear_vertices(tolerance))
+            except AssertionError:  # degenerate loop with less than 3 vertices
+                pass
+        floor_faces.append(polygons_to_faces(polygons, hgt))
+    return floor_faces
@@ -0,0 +1,102 @@
+"""Memoized lookup of objects in the honeybee-energy standards library.
+
+The functions of honeybee_energy.lib build a new object from the library data
+each time that an identifier of the standards extension is requested. The
+lookup_objects function shared by the Dragonfly components keeps the objects
+that have already been built so that each identifier is only built once for
+the Rhino session, or until the files of the standards library are changed.
+"""
+import os
+from collections import OrderedDict
+
+try:  # honeybee-energy is only needed to check the library files on disk
+    from honeybee_energy.config import folders
+except ImportError:
+    folders = None
+
+try:
+    basestring
+except NameError:  # Python 3
+    basestring = str
+
+CACHE_SIZE = 100  # maximum number of library objects kept in memory
+
+_objects = OrderedDict()  # library objects keyed by (lookup function, identifier)
+_counts = {'hits': 0, 'misses': 0}
+_library = {'stamp': None}  # the library_stamp of the objects in the cache
+
+
+def library_stamp():
+    """Get the names and modification times of the files of the standards library."""
+    if folders is None:
+        return ()
+    stamp = []
+    lib_folders = [folders.standards_data_folder] + \
+        list(folders.standards_extension_folders)
+    for lib_folder in lib_folders:
+        for root, _, files in os.walk(lib_folder):
+            for f in sorted(files):
+                stamp.append((f, os.path.getmtime(os.path.join(root, f))))
+    return tuple(stamp)
+
+
+def lookup_objects(values, lookup):
+    """Replace the identifiers in a list with objects from the standards library.
+
+    Objects that have already been looked up are reused and at most CACHE_SIZE
+    of the most recently used objects are kept. All returned library objects
+    are locked so that they can be shared between components without one of
+    them editing the objects of another. Use their duplicate() method to get
+    an object that can be edited.
+
+    The cache is cleared whenever a file of the standards library folders is
+    added, removed or modified. The objects are also stored with the lookup
+    function that produced them such that objects of reloaded honeybee_energy.lib
+    modules are looked up again.
+
+    Args:
+        values: A list of identifiers and objects. Objects are returned unchanged.
+        lookup: The library function that gets an object from its identifier
+            (eg. program_type_by_identifier).
+
+    Returns:
+        A list of objects with the same length as the input values.
+    """
+    stamp = library_stamp()
+    if stamp != _library['stamp']:  # the library files have changed
+        _objects.clear()
+        _library['stamp'] = stamp
+    result = []
+    for value in values:
+        if isinstance(value, basestring):
+            key = (lookup, value)
+            try:
+                value = _objects.pop(key)
+                _counts['hits'] += 1
+            except KeyError:  # not yet looked up in the library
+                value = lookup(value)
+                try:
+                    value.lock()
+                except AttributeError:
+                    pass  # not a lockable object
+                _counts['misses'] += 1
+                if len(_objects) >= CACHE_SIZE:
+                    _objects.popitem(last=False)  # drop the least recently used
+            _objects[key] = value
+        result.append(value)
+    return result
+
+
+def cache_info():
+    """Get a dictionary with the hits, misses and current size of the cache."""
+    info = dict(_counts)
+    info['size'] = len(_objects)
+    info['max_size'] = CACHE_SIZE
+    return info
+
+
+def clear_cache():
+    """Remove all objects from the cache and reset the hit and miss counts."""
+    _objects.clear()
+    _counts['hits'] = 0
+    _counts['misses'] = 0
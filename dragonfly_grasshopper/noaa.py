@@ -0,0 +1,770 @@
+"""Decode NOAA .csv files of hourly weather data and convert them to weather files.
+
+The functions are shared by the "DF Import NOAA File" and "DF Batch NOAA to EPW"
+components. The module can also be run from the command line to convert a
+folder of NOAA .csv files into .epw and .ddy files without Rhino:
+
+    python -m dragonfly_grasshopper.noaa path/to/noaa_folder --folder path/to/epws
+"""
+import os
+import sys
+import csv
+import json
+import time
+import array
+import shutil
+import hashlib
+import tempfile
+import argparse
+from itertools import islice
+
+try:  # processes are used to convert several stations at once outside of .NET
+    import multiprocessing
+except ImportError:
+    multiprocessing = None  # the stations are converted in .NET tasks or one by one
+
+from ladybug.config import folders
+from ladybug.location import Location
+from ladybug.dt import DateTime
+from ladybug.analysisperiod import AnalysisPeriod
+from ladybug.header import Header
+from ladybug.datacollection import HourlyDiscontinuousCollection
+from ladybug.datatype.temperature import DryBulbTemperature, DewPointTemperature
+from ladybug.datatype.speed import WindSpeed
+from ladybug.datatype.angle import WindDirection
+from ladybug.datatype.fraction import TotalSkyCover
+from ladybug.datatype.pressure import AtmosphericStationPressure
+from ladybug.datatype.distance import Visibility, CeilingHeight
+from ladybug.epw import EPW
+
+from .weather import EPW_FIELD_COUNT, relative_humidities, sky_emissivities, \
+    horizontal_infrared
+from .parallel import tasks, run_in_parallel
+
+
+def extract_location(climate_file, time_zone=None):
+    """Extract a Ladybug Location object from the data in the CSV.
+
+    Args:
+        climate_file: file path to the NCDC .csv file.
+        time_zone: Optional integer for the time zone. If None, it will be
+            estimated from the longitude in the file.
+    """
+    with open(climate_file) as station_file:
+        station_file.readline()  # Skip header row
+
+        # get the pattern of data within the file
+        dat_line = station_file.readline().strip().split(',')
+
+        # parse all of the info from the file
+        station_id = dat_line[0].replace('"', '')
+        city = dat_line[6].replace('"', '')
+        latitude = float(dat_line[3].replace('"', ''))
+        longitude = float(dat_line[4].replace('"', ''))
+        elevation = float(dat_line[5].replace('"', ''))
+
+        # estimate or parse time zone.
+        if time_zone:
+            assert -12 <= time_zone <= 14, ' time_zone must be between -12 and '\
+                ' 14. Got {}.'.format(time_zone)
+            time_zone = time_zone
+        else:
+            time_zone = int((longitude / 180) * 12)
+
+        # build the location object
+        location = Location(
+            city=city, latitude=latitude, longitude=longitude,
+            time_zone=time_zone, elevation=elevation,
+            station_id=station_id, source='NCDC')
+    return location, time_zone
+
+
+# number of days in the year before the start of each month (for a non-leap year)
+MONTH_DAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def days_before_year(year):
+    """Get the number of days in the Gregorian calendar before the start of a year."""
+    yr = year - 1
+    return yr * 365 + yr // 4 - yr // 100 + yr // 400
+
+
+def parse_noaa_date(date_str):
+    """Get the year and the minute of that year from a NOAA date string.
+
+    Args:
+        date_str: A NOAA date string (eg. 2003-01-01T01:00:00).
+    """
+    yr, month, day, hr, minute = int(date_str[:4]), int(date_str[5:7]), \
+        int(date_str[8:10]), int(date_str[11:13]), int(date_str[14:16])
+    doy = MONTH_DAYS[month - 1] + day - 1
+    if month > 2 and yr % 4 == 0 and (yr % 100 != 0 or yr % 400 == 0):
+        doy += 1
+    return yr, doy * 1440 + hr * 60 + minute
+
+
+def build_collection(field, data_type, unit, index, year, timestep, dt_cache):
+    """Build a data collection from raw noaa data and process it to the timestep.
+
+    Args:
+        field: A tuple with an array of values for each row of the NOAA file and
+            an array of flags for whether each value is valid. The flags can
+            be None if all values are valid.
+        data_type: Ladybug data type for the data collection.
+        unit: Text for the unit of the collection.
+        index: An array of integers for the minute of the year of each row of
+            the NOAA file. Rows with a minute of -1 lie outside the year.
+        year: Integer for the year of the data.
+        timestep: Integer for the timestep of the data collection.
+        dt_cache: A dictionary of Ladybug DateTimes keyed by their minute of
+            the year, which is shared between the collections of a file.
+    """
+    values, mask = field
+    if mask is not None and not any(mask):
+        return None
+
+    # cull out unwanted timesteps and ensure no duplicates
+    leap_yr = True if year % 4 == 0 else False
+    mins_per_step = 60 // timestep
+    if mask is None:
+        steps = sorted((moy, i) for i, moy in enumerate(index)
+                       if moy >= 0 and moy % mins_per_step == 0)
+    else:
+        steps = sorted((moy, i) for i, (moy, valid) in enumerate(zip(index, mask))
+                       if valid and moy >= 0 and moy % mins_per_step == 0)
+    datetimes, clean_values = [], []
+    last_moy = -1
+    for moy, i in steps:
+        if moy != last_moy:
+            try:
+                lb_dat = dt_cache[moy]
+            except KeyError:
+                lb_dat = DateTime.from_moy(moy, leap_yr)
+                dt_cache[moy] = lb_dat
+            datetimes.append(lb_dat)
+            clean_values.append(values[i])
+            last_moy = moy
+    if len(clean_values) == 0:
+        return None
+
+    # make a discontinuous cata collection
+    a_period = AnalysisPeriod(timestep=timestep, is_leap_year=leap_yr)
+    data_header = Header(data_type, unit, a_period)
+    data_init = HourlyDiscontinuousCollection(data_header, clean_values, datetimes)
+    return data_init.validate_analysis_period()
+
+
+# the weather fields decoded from the NOAA file and how to interpret them
+# (field name, NOAA column, position in the column, missing code, converter)
+NOAA_FIELDS = (
+    ('wind_direction', 'WND', 0, '999', float),
+    ('wind_speed', 'WND', 3, '9999', lambda v: float(v) / 10),
+    ('ceiling_height', 'CIG', 0, '99999', float),
+    ('visibility', 'VIS', 0, '999999', lambda v: float(v) / 1000),
+    ('dry_bulb_temp', 'TMP', 0, '+9999', lambda v: float(v) / 10),
+    ('dew_point_temp', 'DEW', 0, '+9999', lambda v: float(v) / 10),
+    ('atmos_pressure', 'SLP', 0, '99999', lambda v: float(v) * 10),
+    ('total_sky_cover', 'GF1', 0, '99', lambda v: min(int(v) * 1.25, 10))
+)
+
+# the ladybug data type and unit of each field in NOAA_FIELDS
+FIELD_TYPES = (
+    ('wind_direction', WindDirection(), 'degrees'),
+    ('wind_speed', WindSpeed(), 'm/s'),
+    ('ceiling_height', CeilingHeight(), 'm'),
+    ('visibility', Visibility(), 'km'),
+    ('dry_bulb_temp', DryBulbTemperature(), 'C'),
+    ('dew_point_temp', DewPointTemperature(), 'C'),
+    ('atmos_pressure', AtmosphericStationPressure(), 'Pa'),
+    ('total_sky_cover', TotalSkyCover(), 'tenths')
+)
+
+
+def year_collections(year, index, columns, timestep, dt_cache):
+    """Build the data collections of each field in NOAA_FIELDS for a year.
+
+    Args:
+        year: Integer for the year of the data.
+        index: An array of integers for the minute of the year of each row.
+        columns: A dictionary with a key for each field in NOAA_FIELDS and a
+            tuple of values and validity flags for each row.
+        timestep: Integer for the timestep of the data collections.
+        dt_cache: A dictionary of Ladybug DateTimes keyed by their minute of
+            the year, which is shared between the collections.
+
+    Returns:
+        A dictionary of data collections keyed by the field names of NOAA_FIELDS.
+        The data collection is None for fields without any valid values.
+    """
+    return dict((field, build_collection(columns[field], data_type, unit, index,
+                                         year, timestep, dt_cache))
+                for field, data_type, unit in FIELD_TYPES)
+
+
+def first_noaa_date(climate_file):
+    """Get the year and minute of the year of the first row of a NOAA .csv file."""
+    with open(climate_file) as station_file:
+        station_file.readline()  # Skip header row
+        dat_line = station_file.readline().strip().split(',')
+    return parse_noaa_date(dat_line[1].replace('"', ''))
+
+
+def decode_noaa_chunks(climate_file, chunk_size=8760):
+    """Decode the weather fields of a NOAA .csv file in chunks of typed arrays.
+
+    Rows are read in chunks and each NOAA column is decoded for the whole chunk
+    at once. The date column is parsed into integers for the year and the minute
+    of the year. Values flagged with a missing code are left out of each field's
+    mask such that the arrays of all fields align with these dates.
+
+    Args:
+        climate_file: file path to the NCDC .csv file.
+        chunk_size: Integer for the number of rows to decode in each batch.
+
+    Returns:
+        A generator of tuples with three elements for each chunk of rows.
+
+        -   years: An array of integers for the year of each row in the chunk.
+
+        -   minutes: An array of integers for the minute of the year of each
+            row in the chunk (in UTC time).
+
+        -   columns: A dictionary with a key for each field in NOAA_FIELDS.
+            Each value is a tuple of an array of floats for the decoded
+            values and an array of bytes, which is 1 where the value is valid.
+    """
+    with open(climate_file) as csv_file:
+        csv_reader = csv.reader(csv_file, delimiter=',', skipinitialspace=True)
+        header = next(csv_reader)  # get header row
+        col_index = dict((col_name, i) for i, col_name in enumerate(header))
+
+        while True:
+            rows = list(islice(csv_reader, chunk_size))
+            if len(rows) == 0:
+                break
+            years, minutes = array.array('h'), array.array('l')
+            for yr, moy in (parse_noaa_date(row[1]) for row in rows):
+                years.append(yr)
+                minutes.append(moy)
+
+            # split each NOAA column once and decode all fields that use it
+            columns, split_cols = {}, {}
+            for field, col_name, position, missing, convert in NOAA_FIELDS:
+                try:
+                    split_col = split_cols[col_name]
+                except KeyError:
+                    try:
+                        i = col_index[col_name]
+                        split_col = [row[i].split(',') for row in rows]
+                    except KeyError:  # the column does not exist in the file
+                        split_col = [[missing] * (position + 1)] * len(rows)
+                    split_cols[col_name] = split_col
+                codes = [info[position] if info[0] != '' else missing
+                         for info in split_col]
+                valid = [code != missing for code in codes]
+                values = array.array('d', [convert(code) if val else 0
+                                           for code, val in zip(codes, valid)])
+                columns[field] = (values, array.array('B', valid))
+            yield years, minutes, columns
+
+
+NOAA_CACHE_FOLDER = os.path.join(folders.default_epw_folder, 'noaa_cache')
+NOAA_CACHE_SIZE = 200 * 1024 * 1024  # bytes above which old entries are evicted
+STALE_PART_AGE = 24 * 3600  # seconds after which an unfinished entry is removed
+
+# the number of bytes of each decoded row in the files of the cache
+ROW_BYTES = array.array('h').itemsize + array.array('l').itemsize + \
+    len(NOAA_FIELDS) * (array.array('d').itemsize + array.array('B').itemsize)
+
+
+def noaa_cache_key(climate_file, chunk_size):
+    """Get the cache key of a NOAA .csv file from its hash, size, mtime and chunk size."""
+    file_hash = hashlib.sha1()
+    with open(climate_file, 'rb') as csv_file:
+        for block in iter(lambda: csv_file.read(1024 * 1024), b''):
+            file_hash.update(block)
+    f_stat = os.stat(climate_file)
+    return '{}_{}_{}_{}'.format(file_hash.hexdigest(), f_stat.st_size,
+                                int(f_stat.st_mtime), chunk_size)
+
+
+def cache_chunk_files(entry_folder):
+    """Get the files of the chunks in an entry of the NOAA cache.
+
+    Each chunk file is named with the index of the chunk and its number of rows
+    (eg. 0_8760.bin) such that the entry can be checked without reading it.
+
+    Returns:
+        A list of tuples with the path and the number of rows of each chunk
+        file in order. None if the entry does not exist or it is malformed.
+    """
+    chunks = []
+    try:
+        for f_name in os.listdir(entry_folder):
+            if not f_name.endswith('.bin'):
+                return None
+            index, row_count = f_name[:-4].split('_')
+            index, row_count = int(index), int(row_count)
+            chunk_file = os.path.join(entry_folder, f_name)
+            if os.path.getsize(chunk_file) != row_count * ROW_BYTES:
+                return None  # the file is truncated
+            chunks.append((index, row_count, chunk_file))
+    except (OSError, ValueError):  # missing entry or unexpected file
+        return None
+    chunks.sort()
+    if [chunk[0] for chunk in chunks] != list(range(len(chunks))):
+        return None  # some of the chunks are missing
+    return [(chunk_file, row_count) for _, row_count, chunk_file in chunks]
+
+
+def read_cache_chunk(chunk_file, row_count):
+    """Read the decoded arrays of a chunk from a file of the NOAA cache.
+
+    Returns:
+        A tuple of years, minutes and columns as yielded by decode_noaa_chunks.
+    """
+    with open(chunk_file, 'rb') as inf:
+        years, minutes = array.array('h'), array.array('l')
+        years.fromfile(inf, row_count)
+        minutes.fromfile(inf, row_count)
+        columns = {}
+        for field in NOAA_FIELDS:
+            values, mask = array.array('d'), array.array('B')
+            values.fromfile(inf, row_count)
+            mask.fromfile(inf, row_count)
+            columns[field[0]] = (values, mask)
+    return years, minutes, columns
+
+
+def write_cache_chunk(entry_folder, index, years, minutes, columns):
+    """Write the decoded arrays of a chunk to a file in an entry of the NOAA cache."""
+    f_name = '{}_{}.bin'.format(index, len(years))
+    with open(os.path.join(entry_folder, f_name), 'wb') as outf:
+        years.tofile(outf)
+        minutes.tofile(outf)
+        for field in NOAA_FIELDS:
+            values, mask = columns[field[0]]
+            values.tofile(outf)
+            mask.tofile(outf)
+
+
+def evict_noaa_cache(keep_folder):
+    """Remove the least recently used entries until the cache is below NOAA_CACHE_SIZE.
+
+    The last use of each entry is the modification time of its folder, which
+    is updated each time that the entry is read. Unfinished entries that are
+    older than STALE_PART_AGE and files of older versions of the cache are
+    also removed.
+
+    Args:
+        keep_folder: The folder of an entry that should not be removed.
+    """
+    entries, now = [], time.time()
+    for f_name in os.listdir(NOAA_CACHE_FOLDER):
+        entry_folder = os.path.join(NOAA_CACHE_FOLDER, f_name)
+        try:
+            if not os.path.isdir(entry_folder):  # file of an older cache version
+                os.remove(entry_folder)
+            elif f_name.endswith('.tmp'):  # entry that is still being written
+                if now - os.path.getmtime(entry_folder) > STALE_PART_AGE:
+                    shutil.rmtree(entry_folder, ignore_errors=True)
+            else:
+                size = sum(os.path.getsize(os.path.join(entry_folder, f))
+                           for f in os.listdir(entry_folder))
+                entries.append((os.path.getmtime(entry_folder), size, entry_folder))
+        except OSError:  # the entry was removed by another process
+            pass
+
+    cache_size = sum(entry[1] for entry in entries)
+    for _, size, entry_folder in sorted(entries):
+        if cache_size <= NOAA_CACHE_SIZE:
+            break
+        if entry_folder != keep_folder:
+            shutil.rmtree(entry_folder, ignore_errors=True)
+            cache_size -= size
+
+
+def cached_noaa_chunks(climate_file, chunk_size=8760):
+    """Decode a NOAA .csv file in chunks, using the cache of decoded files if possible.
+
+    The decoded arrays only depend on the file such that changes to the time
+    zone or timestep do not require the .csv file to be parsed again. Each
+    chunk has its own file in the cache entry of the .csv file, which is read
+    or written as the chunk is yielded such that only one chunk is held in
+    memory at a time. Entries that are missing or malformed are treated as
+    a miss and a new entry is only added to the cache once all of its chunks
+    have been written.
+
+    Args:
+        climate_file: file path to the NCDC .csv file.
+        chunk_size: Integer for the number of rows in each chunk.
+
+    Returns:
+        A generator of the same chunks as decode_noaa_chunks.
+    """
+    key = noaa_cache_key(climate_file, chunk_size)
+    entry_folder = os.path.join(NOAA_CACHE_FOLDER, key)
+    chunk_files = cache_chunk_files(entry_folder)
+    if chunk_files is not None:
+        try:
+            os.utime(entry_folder, None)  # mark the entry as recently used
+        except OSError:  # the entry is not writable
+            pass
+        for i, (chunk_file, row_count) in enumerate(chunk_files):
+            try:
+                chunk = read_cache_chunk(chunk_file, row_count)
+            except (IOError, OSError, EOFError):  # the entry has been removed
+                chunks = decode_noaa_chunks(climate_file, chunk_size)
+                for chunk in islice(chunks, i, None):  # decode the remaining chunks
+                    yield chunk
+                return
+            yield chunk
+        return
+
+    # decode the file and write each chunk to an unfinished entry of the cache
+    try:
+        if os.path.isdir(entry_folder):  # remove the malformed entry
+            shutil.rmtree(entry_folder)
+        if not os.path.isdir(NOAA_CACHE_FOLDER):
+            os.makedirs(NOAA_CACHE_FOLDER)
+        part_folder = tempfile.mkdtemp(suffix='.tmp', dir=NOAA_CACHE_FOLDER)
+    except (IOError, OSError):  # the cache folder is not writable
+        part_folder = None
+    complete = False
+    try:
+        for i, chunk in enumerate(decode_noaa_chunks(climate_file, chunk_size)):
+            if part_folder is not None:
+                try:
+                    write_cache_chunk(part_folder, i, *chunk)
+                except (IOError, OSError):  # the disk is full
+                    shutil.rmtree(part_folder, ignore_errors=True)
+                    part_folder = None
+            yield chunk
+        complete = True
+    finally:
+        if part_folder is not None and not complete:
+            shutil.rmtree(part_folder, ignore_errors=True)
+
+    # add the finished entry to the cache and evict the old entries
+    if part_folder is not None:
+        try:
+            os.rename(part_folder, entry_folder)
+            evict_noaa_cache(entry_folder)
+        except (IOError, OSError):  # another process has added the same entry
+            shutil.rmtree(part_folder, ignore_errors=True)
+
+
+def noaa_years(climate_files, time_offset, chunk_size=8760, use_cache=False):
+    """Stream NOAA .csv files and yield the decoded fields of each year in local time.
+
+    The files are read in chronological order and the rows of each chunk are
+    partitioned by the year in which they fall once shifted to the time zone.
+    Each year is yielded as soon as no later row can fall into it such that only
+    the years currently being read are held in memory. Years that are only
+    reached by the time zone shift (and are not in the files) are not yielded.
+
+    Args:
+        climate_files: A list of file paths to NCDC .csv files for the same station.
+        time_offset: Integer for the minutes to add to each date in order
+            to correct for the time zone.
+        chunk_size: Integer for the number of rows to decode in each batch.
+        use_cache: Boolean to note whether the decoded files should be read from
+            (and added to) the cache of decoded files. (Default: False).
+
+    Returns:
+        A generator of tuples with three elements for each year in the files.
+
+        -   year: Integer for the year.
+
+        -   index: An array of integers for the minute of the year of each row.
+
+        -   columns: A dictionary with a key for each field in NOAA_FIELDS
+            and a tuple of values and validity flags for each row.
+    """
+    file_years = set()  # the years that are found in the files
+    year_mins = {}  # the number of minutes in each year
+    partitions = {}
+    read_chunks = cached_noaa_chunks if use_cache else decode_noaa_chunks
+    for climate_file in sorted(climate_files, key=first_noaa_date):
+        for years, minutes, columns in read_chunks(climate_file, chunk_size):
+            # shift the dates to the time zone to get the local year of each row
+            loc_years, loc_minutes = [], []
+            for yr in set(years):
+                file_years.add(yr)
+                for y in (yr - 1, yr, yr + 1):
+                    if y not in year_mins:
+                        y_days = days_before_year(y + 1) - days_before_year(y)
+                        year_mins[y] = y_days * 1440
+            for yr, moy in zip(years, minutes):
+                moy += time_offset
+                if moy < 0:
+                    yr -= 1
+                    moy += year_mins[yr]
+                elif moy >= year_mins[yr]:
+                    moy -= year_mins[yr]
+                    yr += 1
+                loc_years.append(yr)
+                loc_minutes.append(moy)
+
+            # add the rows of the chunk to the partition of each year
+            for yr in set(loc_years):
+                rows = [i for i, y in enumerate(loc_years) if y == yr]
+                try:
+                    index, part_cols = partitions[yr]
+                except KeyError:
+                    index, part_cols = array.array('l'), {}
+                    for field in NOAA_FIELDS:
+                        part_cols[field[0]] = (array.array('d'), array.array('B'))
+                    partitions[yr] = (index, part_cols)
+                index.extend(loc_minutes[i] for i in rows)
+                for field, (values, mask) in columns.items():
+                    part_values, part_mask = part_cols[field]
+                    part_values.extend(values[i] for i in rows)
+                    part_mask.extend(mask[i] for i in rows)
+
+            # yield the years that cannot receive any more rows
+            for yr in sorted(partitions):
+                if yr < years[0] - 1:
+                    index, part_cols = partitions.pop(yr)
+                    if yr in file_years:
+                        yield yr, index, part_cols
+
+    for yr in sorted(partitions):
+        if yr in file_years:
+            index, part_cols = partitions.pop(yr)
+            yield yr, index, part_cols
+
+
+def noaa_station_files(noaa_folder):
+    """Group the NOAA .csv files in a folder by the ID of the station in each file."""
+    stations = {}
+    for f_name in sorted(os.listdir(noaa_folder)):
+        if not f_name.lower().endswith('.csv'):
+            continue
+        noaa_file = os.path.join(noaa_folder, f_name)
+        with open(noaa_file) as station_file:
+            station_file.readline()  # Skip header row
+            station_id = station_file.readline().split(',')[0].replace('"', '')
+        if station_id:
+            stations.setdefault(station_id, []).append(noaa_file)
+    return stations
+
+
+# the EPW properties that are set by each field in NOAA_FIELDS
+EPW_PROPERTIES = (
+    ('wind_direction', ('wind_direction',)),
+    ('wind_speed', ('wind_speed',)),
+    ('ceiling_height', ('ceiling_height',)),
+    ('visibility', ('visibility',)),
+    ('dry_bulb_temp', ('dry_bulb_temperature',)),
+    ('dew_point_temp', ('dew_point_temperature',)),
+    ('atmos_pressure', ('atmospheric_station_pressure',)),
+    ('total_sky_cover', ('total_sky_cover', 'opaque_sky_cover'))
+)
+
+
+def build_epw(location, year, collections):
+    """Build an EPW object from the NOAA data collections of a single year.
+
+    Each collection has its holes filled by linear interpolation. The relative
+    humidity and horizontal infrared radiation are derived with the same
+    functions of dragonfly_grasshopper.weather as the weather components.
+
+    Args:
+        location: A Ladybug Location for the station.
+        year: Integer for the year of the data.
+        collections: A dictionary of the data collections of the year keyed by
+            the field names of NOAA_FIELDS.
+    """
+    data = {}
+    for field, coll in collections.items():
+        if coll is not None:
+            data[field] = coll.interpolate_holes().values
+    for field in ('dry_bulb_temp', 'dew_point_temp'):
+        assert field in data, 'No {} data was found for {}.'.format(field, year)
+
+    epw_obj = EPW.from_missing_values(is_leap_year=year % 4 == 0)
+    epw_obj.location = location
+    epw_obj.years.values = [year] * len(epw_obj.years)
+    for field, props in EPW_PROPERTIES:
+        if field in data:
+            for prop in props:
+                getattr(epw_obj, prop).values = data[field]
+    dry_bulb, dew_point = data['dry_bulb_temp'], data['dew_point_temp']
+    epw_obj.relative_humidity.values = relative_humidities(dry_bulb, dew_point)
+    if 'total_sky_cover' in data:
+        sky_emiss = sky_emissivities(data['total_sky_cover'], dew_point)
+        epw_obj.horizontal_infrared_radiation_intensity.values = \
+            horizontal_infrared(sky_emiss, dry_bulb)
+    return epw_obj
+
+
+def write_ddy(epw_obj, file_path, percentile):
+    """Write a .ddy file with a heating and cooling design day derived from an EPW.
+
+    The design days of leap years are derived from the data without February 29th
+    since the design day approximation of the EPW expects a 365-day year.
+    """
+    if not epw_obj.is_leap_year:
+        return epw_obj.to_ddy(file_path, percentile)
+    ddy_epw = EPW.from_missing_values()
+    ddy_epw.location = epw_obj.location
+    feb_29 = slice(1416, 1440)  # hours of February 29th in a leap year
+    for field in range(EPW_FIELD_COUNT):
+        values = list(epw_obj.import_data_by_field(field).values)
+        del values[feb_29]
+        ddy_epw.import_data_by_field(field).values = values
+    return ddy_epw.to_ddy(file_path, percentile)
+
+
+def station_to_weather_files(station_id, noaa_files, folder, percentile):
+    """Write the .epw and .ddy files of every year of data for a station.
+
+    Args:
+        station_id: Text for the ID of the station.
+        noaa_files: A list of NOAA .csv file paths for the station.
+        folder: The directory into which the weather files will be written.
+        percentile: A number for the percentile of the design days.
+
+    Returns:
+        A list with a manifest dictionary for each year of the station. Each
+        dictionary has the station, year, noaa_files, epw, ddy, error and seconds
+        keys. The epw and ddy are None if they were not written and the error is
+        None if the year succeeded. If the files of the station cannot be read,
+        the list has a single dictionary with a year of None.
+    """
+    records, start = [], time.time()
+    try:
+        location, t_zone = extract_location(noaa_files[0])
+        t_offset = int(round(t_zone * 60))
+        dt_caches = {True: {}, False: {}}
+        for year, index, columns in noaa_years(noaa_files, t_offset):
+            record = {'station': station_id, 'year': year, 'noaa_files': noaa_files,
+                      'epw': None, 'ddy': None, 'error': None}
+            try:
+                collections = year_collections(
+                    year, index, columns, 1, dt_caches[year % 4 == 0])
+                epw_obj = build_epw(location, year, collections)
+                f_name = '{}_{}'.format(station_id, year)
+                record['epw'] = epw_obj.save(os.path.join(folder, f_name + '.epw'))
+                record['ddy'] = write_ddy(
+                    epw_obj, os.path.join(folder, f_name + '.ddy'), percentile)
+            except Exception as e:
+                record['error'] = str(e)
+            record['seconds'] = round(time.time() - start, 3)
+            records.append(record)
+            start = time.time()
+    except Exception as e:
+        records.append({'station': station_id, 'year': None, 'noaa_files': noaa_files,
+                        'epw': None, 'ddy': None, 'error': str(e),
+                        'seconds': round(time.time() - start, 3)})
+    return records
+
+
+def station_weather_files(args):
+    """Call station_to_weather_files with a tuple of its arguments.
+
+    This is used by the process pool of folder_to_weather_files, which can only
+    call functions of a single argument that are defined at the module level.
+    """
+    return station_to_weather_files(*args)
+
+
+def folder_to_weather_files(noaa_folder, folder=None, percentile=0.4, cpus=None):
+    """Write .epw and .ddy files for each station and year in a folder of NOAA files.
+
+    Several stations are processed at once if possible and a manifest.json with
+    the files, timings and failures of each station is written next to the EPWs.
+    In .NET, the stations are processed in parallel tasks. Elsewhere (eg. from the
+    command line in cPython), a pool of processes is used when cpus is above 1.
+
+    Args:
+        noaa_folder: The path to a folder containing .csv files obtained from
+            the NOAA database.
+        folder: A directory into which all of the weather files will be written.
+            If None, the ladybug default EPW folder will be used.
+        percentile: A number between 0 and 50 for the percentile difference
+            from the most extreme conditions within each EPW to be used for
+            the design days of the .ddy files. (Default: 0.4).
+        cpus: An optional integer for the number of stations to process at once.
+            If None, the .NET task scheduler will decide and, outside of .NET,
+            the stations are processed one after the other. (Default: None).
+
+    Returns:
+        A tuple with two elements.
+
+        -   records: A list with a manifest dictionary for each year of each
+            station, in the order of the station IDs.
+
+        -   manifest: The path to the manifest.json file.
+    """
+    assert os.path.isdir(noaa_folder), \
+        'No folder was found at: {}'.format(noaa_folder)
+    folder = folders.default_epw_folder if folder is None else folder
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    stations = sorted(noaa_station_files(noaa_folder).items())
+    if tasks is None and multiprocessing is not None and cpus is not None \
+            and cpus > 1 and len(stations) > 1:
+        # the files of each station are converted in a separate process
+        pool = multiprocessing.Pool(min(cpus, len(stations)))
+        try:
+            results = pool.map(station_weather_files, [
+                (station_id, noaa_files, folder, percentile)
+                for station_id, noaa_files in stations])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [None] * len(stations)
+
+        def process_station(i):
+            station_id, noaa_files = stations[i]
+            results[i] = station_to_weather_files(
+                station_id, noaa_files, folder, percentile)
+
+        run_in_parallel(process_station, len(stations), cpus)
+
+    records = [rec for station_recs in results for rec in station_recs]
+    manifest = os.path.join(folder, 'manifest.json')
+    with open(manifest, 'w') as fp:
+        json.dump(records, fp, indent=4)
+    return records, manifest
+
+
+def main(args=None):
+    """Convert a folder of NOAA .csv files to weather files from the command line.
+
+    Returns:
+        An exit code, which is 1 if any station or year failed and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m dragonfly_grasshopper.noaa',
+        description='Convert a folder of NOAA .csv files into .epw and .ddy '
+        'files for each station and year.')
+    parser.add_argument('noaa_folder', help='Folder of .csv files from NOAA.')
+    parser.add_argument('--folder', default=None, help='Folder into which the '
+                        'weather files are written. (Default: the ladybug EPW folder).')
+    parser.add_argument('--percentile', type=float, default=0.4, help='Percentile '
+                        'of the design days in the .ddy files. (Default: 0.4).')
+    parser.add_argument('--cpus', type=int, default=None, help='Number of '
+                        'processes used to convert several stations at once. '
+                        '(Default: one station at a time).')
+    opts = parser.parse_args(args)
+    if not os.path.isdir(opts.noaa_folder):
+        parser.error('No folder was found at: {}'.format(opts.noaa_folder))
+
+    records, manifest = folder_to_weather_files(
+        opts.noaa_folder, opts.folder, opts.percentile, opts.cpus)
+    failed = [rec for rec in records if rec['error'] is not None]
+    for rec in failed:
+        print('Station {} failed after {} seconds:\n{}'.format(
+            rec['station'], rec['seconds'], rec['error']))
+    print('{} weather files were written. See {} for details.'.format(
+        len([rec for rec in records if rec['epw'] is not None]), manifest))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
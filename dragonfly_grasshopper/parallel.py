@@ -0,0 +1,46 @@
+"""Run a function over several items at once with the .NET task library.
+
+Outside of .NET (eg. in cPython), the items are processed one after the other.
+"""
+try:  # import the .NET task library to run functions in parallel
+    import System.Threading.Tasks as tasks
+except ImportError:
+    tasks = None  # not running in .NET; items are processed one at a time
+
+
+def run_in_parallel(function, count, cpus=None):
+    """Call a function for each integer in range(count), several at once if possible.
+
+    Errors raised by the function are not wrapped in the .NET AggregateException
+    of Parallel.ForEach. Once a call fails, the calls that have not yet started
+    are skipped and the original error of the failed call with the lowest
+    integer is raised again.
+
+    Args:
+        function: A function that takes an integer as its only argument.
+        count: The number of times to call the function.
+        cpus: An optional integer for the maximum number of calls to run at
+            once. If None, the .NET task scheduler will decide. Values of 1 or
+            less will call the function one integer at a time. (Default: None).
+    """
+    if tasks is None or count < 2 or (cpus is not None and cpus <= 1):
+        for i in range(count):
+            function(i)
+        return
+
+    errors = []
+
+    def run(i):
+        if errors:
+            return  # another call has failed; there is no need for this one
+        try:
+            function(i)
+        except Exception as e:
+            errors.append((i, e))
+
+    options = tasks.ParallelOptions()
+    if cpus is not None:
+        options.MaxDegreeOfParallelism = cpus
+    tasks.Parallel.ForEach(range(count), options, run)
+    if errors:
+        raise min(errors, key=lambda error: error[0])[1]
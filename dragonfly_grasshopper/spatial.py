@@ -0,0 +1,93 @@
+"""Uniform grid to find the objects near one another in plan.
+
+The grid indexes the bounding rectangles of Buildings and ContextShades such
+that the objects within a distance of one of them can be found without
+checking every other object of the Model.
+"""
+import math
+
+from ladybug_geometry.geometry2d.pointvector import Point2D
+
+MAX_GRID_CELLS = 1000  # objects spanning more cells are checked against everything
+
+
+def bound_points(obj):
+    """Get the Point2Ds (min, center, max) of the bounding rectangle of an object."""
+    o_min, o_max = obj.min, obj.max
+    center = Point2D((o_min.x + o_max.x) / 2, (o_min.y + o_max.y) / 2)
+    return o_min, center, o_max
+
+
+def bound_rect_in_dist(bound_pts1, bound_pts2, distance):
+    """Check if the bounding rectangles of two objects overlap within a distance.
+
+    Args:
+        bound_pts1: A list of Point2Ds (min, center, max) for the first object.
+        bound_pts2: A list of Point2Ds (min, center, max) for the second object.
+        distance: Acceptable distance between the two bounding rectangles.
+    """
+    x_gap = abs(bound_pts1[1].x - bound_pts2[1].x) - \
+        (0.5 * (bound_pts1[2].x - bound_pts1[0].x)) - \
+        (0.5 * (bound_pts2[2].x - bound_pts2[0].x))
+    y_gap = abs(bound_pts1[1].y - bound_pts2[1].y) - \
+        (0.5 * (bound_pts1[2].y - bound_pts1[0].y)) - \
+        (0.5 * (bound_pts2[2].y - bound_pts2[0].y))
+    return not (x_gap > distance or y_gap > distance)
+
+
+def grid_cells(x1, y1, x2, y2, cell_size):
+    """Get the (column, row) tuples of the grid cells that overlap a rectangle."""
+    cols = range(int(math.floor(x1 / cell_size)), int(math.floor(x2 / cell_size)) + 1)
+    rows = range(int(math.floor(y1 / cell_size)), int(math.floor(y2 / cell_size)) + 1)
+    if len(cols) * len(rows) > MAX_GRID_CELLS:
+        return None
+    return [(col, row) for col in cols for row in rows]
+
+
+def spatial_grid(bound_pts, distance):
+    """Get a uniform grid that indexes the bounding rectangles of objects.
+
+    Args:
+        bound_pts: A list of Point2Ds (min, center, max) for each object.
+        distance: The distance that will be used to query the grid, which
+            sets the minimum size of the grid cells.
+
+    Returns:
+        A tuple with the size of the grid cells and a dictionary with the
+        (column, row) of each cell as keys and lists of the indices of the
+        objects overlapping the cell as values. Objects spanning too many
+        cells to be indexed are under the None key.
+    """
+    sizes = [max(pts[2].x - pts[0].x, pts[2].y - pts[0].y) for pts in bound_pts]
+    cell_size = max([distance, sum(sizes) / max(len(sizes), 1)])
+    grid = {None: []}
+    for i, (o_min, _, o_max) in enumerate(bound_pts):
+        cells = grid_cells(o_min.x, o_min.y, o_max.x, o_max.y, cell_size)
+        for cell in cells if cells is not None else (None,):
+            grid.setdefault(cell, []).append(i)
+    return cell_size, grid
+
+
+def objects_in_dist(grid, bound_pts, index, distance):
+    """Get the sorted indices of the objects in a spatial grid within a distance of one.
+
+    Args:
+        grid: A tuple of a cell size and grid dictionary from spatial_grid.
+        bound_pts: The list of Point2Ds (min, center, max) used to make the grid.
+        index: The index of the object around which the others will be found.
+        distance: Acceptable distance between the bounding rectangles.
+    """
+    cell_size, cells = grid
+    o_min, _, o_max = bound_pts[index]
+    pad = distance + cell_size * 1e-6  # ensure rounding never excludes an object
+    near_cells = grid_cells(o_min.x - pad, o_min.y - pad, o_max.x + pad,
+                            o_max.y + pad, cell_size)
+    if near_cells is None:
+        near = set(range(len(bound_pts)))
+    else:
+        near = set(cells[None])
+        for cell in near_cells:
+            near.update(cells.get(cell, ()))
+    near.discard(index)
+    return sorted(j for j in near
+                  if bound_rect_in_dist(bound_pts[index], bound_pts[j], distance))
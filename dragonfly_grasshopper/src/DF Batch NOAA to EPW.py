@@ -0,0 +1,83 @@
+# Dragonfly: A Plugin for Environmental Analysis (GPL)
+# This file is part of Dragonfly.
+#
+# Copyright (c) 2020, Ladybug Tools.
+# You should have received a copy of the GNU General Public License
+# along with Dragonfly; If not, see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+
+"""
+Convert a folder of .csv files from the National Oceanic and Atmospheric
+Administration (NOAA) database into .epw and .ddy files for each station and year.
+_
+This runs the chain of the "DF Import NOAA File", "DF Horizontal Infrared",
+"DF Create EPW", "DF Write EPW" and "DF Write DDY" components for every station
+in the folder, processing several stations at once. Gaps in the NOAA data are
+filled by linear interpolation before the EPW is created. A manifest.json with
+the files, timings and failures of each station is written next to the EPWs.
+_
+The same conversion can be run without Rhino from the command line with:
+python -m dragonfly_grasshopper.noaa path/to/noaa_folder --folder path/to/epws
+-
+
+    Args:
+        _noaa_folder: The path to a folder containing .csv files obtained from the
+            NOAA database. Files are grouped by the station in them such that
+            several files of the same station (eg. one file per year) produce
+            one EPW for each year of data.
+        _folder_: A directory into which all of the .epw and .ddy files will
+            be written. If None, the ladybug default EPW folder will be used.
+        percentile_: A number between 0 and 50 for the percentile difference
+            from the most extreme conditions within each EPW to be used for
+            the design days of the .ddy files. (Default: 0.4).
+        _cpus_: A positive integer for the number of stations to process
+            at once. (Default: all of the processors on the machine).
+        _run: Set to True to run the component and write the weather files.
+
+    Returns:
+        report: Reports, errors, warnings, etc.
+        epw_files: File paths to the .epw files that were written, one for each
+            year of each station. This is None for the years that failed.
+        ddy_files: File paths to the .ddy files that were written next to
+            each of the epw_files. This is None for the years that failed such
+            that each item aligns with the epw_files and the manifest.
+        manifest: File path to a JSON manifest with the source files, output
+            files, run time in seconds and any error for each station and year.
+"""
+
+ghenv.Component.Name = "DF Batch NOAA to EPW"
+ghenv.Component.NickName = 'BatchNOAA'
+ghenv.Component.Message = '1.1.3'
+ghenv.Component.Category = "Dragonfly"
+ghenv.Component.SubCategory = '4 :: AlternativeWeather'
+ghenv.Component.AdditionalHelpFromDocStrings = "3"
+
+try:
+    from ladybug_rhino.grasshopper import all_required_inputs
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
+
+try:
+    from dragonfly_grasshopper.noaa import folder_to_weather_files
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+
+if all_required_inputs(ghenv.Component) and _run:
+    # process each of the stations, several at a time if possible
+    percentile_ = 0.4 if percentile_ is None else percentile_
+    records, manifest = folder_to_weather_files(
+        _noaa_folder, _folder_, percentile_, _cpus_)
+
+    # output the weather files of each year and report any failures
+    epw_files = [rec['epw'] for rec in records]
+    ddy_files = [rec['ddy'] for rec in records]
+    for rec in records:
+        if rec['error'] is not None:
+            print('Station {} failed after {} seconds:\n{}'.format(
+                rec['station'], rec['seconds'], rec['error']))
+    print('{} weather files were written for {} stations in {} seconds.'.format(
+        len([f for f in epw_files if f is not None]),
+        len(set(rec['station'] for rec in records)),
+        round(sum(rec['seconds'] for rec in records), 2)))
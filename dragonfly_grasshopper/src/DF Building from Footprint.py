@@ -40,6 +40,9 @@ Create Dragonfly Buildings from footprint geometry (horizontal Rhino surfaces).
             to the Buildings's climate or building energy code.
         conditioned_: Boolean to note whether the Buildings have heating and cooling
             systems.
+        _cpus_: A positive integer for the number of Buildings to create at
+            once. Set to 1 to create the Buildings one at a time. (Default: all
+            of the processors on the machine).
         _run: Set to True to run the component and create Dragonfly Buildings.
 
     Returns:
@@ -49,7 +52,7 @@ Create Dragonfly Buildings from footprint geometry (horizontal Rhino surfaces).
 
 ghenv.Component.Name = "DF Building from Footprint"
 ghenv.Component.NickName = 'BuildingFootprint'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.4'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "2"
@@ -72,6 +75,12 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.library import lookup_objects
+    from dragonfly_grasshopper.parallel import run_in_parallel
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:  # import the dragonfly-energy extension
     import dragonfly_energy
     from honeybee_energy.lib.programtypes import program_type_by_identifier, \
@@ -93,28 +102,36 @@ import uuid
 
 if all_required_inputs(ghenv.Component) and _run:
     perim_offset_ = 0 if perim_offset_ is None else perim_offset_
-    buildings = []  # list of buildings that will be returned
-    for i, geo in enumerate(_footprint_geo):
-        # get the name for the Building
+
+    # get the geometry and the names of the Buildings
+    footprints = [to_face3d(geo) for geo in _footprint_geo]
+    names, display_names = [], []
+    for i in range(len(footprints)):
         if len(_name_) == 0:  # make a default Building name
-            name = "Building_{}_{}".format(document_counter('bldg_count'),
-                                           str(uuid.uuid4())[:8])
+            names.append("Building_{}_{}".format(document_counter('bldg_count'),
+                                                 str(uuid.uuid4())[:8]))
         else:
             display_name = '{}_{}'.format(longest_list(_name_, i), i + 1)
-            name = clean_and_id_string(display_name)
+            display_names.append(display_name)
+            names.append(clean_and_id_string(display_name))
 
+    # look up each of the unique programs and construction sets in the library once
+    if len(_program_) != 0:
+        _program_ = lookup_objects(_program_, program_type_by_identifier)
+    if len(_constr_set_) != 0:
+        _constr_set_ = lookup_objects(_constr_set_, construction_set_by_identifier)
+
+    def create_building(i):
         # create the Building
         building = Building.from_footprint(
-            name, footprint=to_face3d(geo), floor_to_floor_heights=_floor_to_floor,
+            names[i], footprint=footprints[i], floor_to_floor_heights=_floor_to_floor,
             perimeter_offset=perim_offset_, tolerance=tolerance)
         if len(_name_) != 0:
-            building.display_name = display_name
+            building.display_name = display_names[i]
 
         # assign the program
         if len(_program_) != 0:
             program = longest_list(_program_, i)
-            if isinstance(program, str):
-                program = program_type_by_identifier(program)
             building.properties.energy.set_all_room_2d_program_type(program)
         else:  # generic office program by default
             try:
@@ -125,8 +142,6 @@ if all_required_inputs(ghenv.Component) and _run:
         # assign the construction set
         if len(_constr_set_) != 0:
             constr_set = longest_list(_constr_set_, i)
-            if isinstance(constr_set, str):
-                constr_set = construction_set_by_identifier(constr_set)
             building.properties.energy.construction_set = constr_set
 
         # assign an ideal air system
@@ -136,4 +151,8 @@ if all_required_inputs(ghenv.Component) and _run:
             except (NameError, AttributeError):
                 pass  # honeybee-energy is not installed
 
-        buildings.append(building)
+        buildings[i] = building
+
+    # create the Buildings, several at a time if possible
+    buildings = [None] * len(footprints)  # list of buildings that will be returned
+    run_in_parallel(create_building, len(footprints), _cpus_)
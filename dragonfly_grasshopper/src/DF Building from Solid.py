@@ -13,6 +13,8 @@ Create Dragonfly Buildings from solid geometry (closed Rhino polysurfaces).
 
     Args:
         _bldg_geo: A list of closed Rhino polysurfaces to be converted into Buildings.
+            This can also be a list of closed ladybug_geometry Polyface3D,
+            which are sliced into floors without the use of Rhino.
         _floor_to_floor: An array of floor-to-floor height instructions
             that describe how a building mass should be divided into floors.
             The array should run from bottom floor to top floor.
@@ -46,6 +48,11 @@ Create Dragonfly Buildings from solid geometry (closed Rhino polysurfaces).
             to the Buildings's climate or building energy code.
         conditioned_: Boolean to note whether the Buildings have heating and cooling
             systems.
+        _cpus_: A positive integer for the number of solids to slice into floors
+            at once. Set to 1 to slice the solids one at a time. Slices are
+            kept in memory such that only solids with new geometry or floor
+            heights are sliced again. (Default: all of the processors on the
+            machine).
         _run: Set to True to run the component and create Dragonfly Buildings.
     
     Returns:
@@ -55,11 +62,16 @@ Create Dragonfly Buildings from solid geometry (closed Rhino polysurfaces).
 
 ghenv.Component.Name = "DF Building from Solid"
 ghenv.Component.NickName = 'BuildingSolid'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.6'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "2"
 
+try:  # import the ladybug_geometry dependencies
+    from ladybug_geometry.geometry3d.polyface import Polyface3D
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug_geometry:\n\t{}'.format(e))
+
 try:  # import the core honeybee dependencies
     from honeybee.typing import clean_and_id_string
 except ImportError as e:
@@ -81,6 +93,14 @@ try:  # import the core ladybug_rhino dependencies
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.library import lookup_objects
+    from dragonfly_grasshopper.parallel import run_in_parallel
+    from dragonfly_grasshopper.geometry import geometry_key, polyface_key, \
+        slice_polyface
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:  # import the dragonfly-energy extension
     import dragonfly_energy
     from honeybee_energy.lib.programtypes import program_type_by_identifier, office_program
@@ -97,46 +117,103 @@ except ImportError as e:
                          'has failed to import.\n{}'.format(e))
 
 import uuid
+from collections import OrderedDict
+
+import scriptcontext as sc
+
+
+SLICE_CACHE_SIZE = 1000  # maximum number of sliced solids kept in memory
+
+
+def solid_key(geo):
+    """Get text that changes whenever the geometry of a solid changes."""
+    if isinstance(geo, Polyface3D):
+        return polyface_key(geo)
+    # closed Rhino polysurface with points on its vertices, edges and faces
+    points = [vert.Location for vert in geo.Vertices]
+    points.extend(edge.PointAtNormalizedLength(0.5) for edge in geo.Edges)
+    points.extend(face.PointAt(face.Domain(0).Mid, face.Domain(1).Mid)
+                  for face in geo.Faces)
+    points = [(pt.X, pt.Y, pt.Z) for pt in points]
+    topology = [(edge.StartVertex.VertexIndex, edge.EndVertex.VertexIndex)
+                for edge in geo.Edges]
+    topology.extend(tuple(face.AdjacentEdges()) for face in geo.Faces)
+    return geometry_key(points, topology)
+
+
+def solid_min_max_height(geo):
+    """Get the minimum and maximum height of a solid."""
+    if isinstance(geo, Polyface3D):
+        return geo.min.z, geo.max.z
+    return geo_min_max_height(geo)
+
+
+def slice_solid(geo, floor_heights):
+    """Get a list of Face3Ds for each floor of a Polyface3D or closed polysurface."""
+    if isinstance(geo, Polyface3D):
+        return slice_polyface(geo, floor_heights, tolerance)
+    floor_faces = []
+    for flr in split_solid_to_floors(geo, floor_heights):
+        story_faces = []
+        for rm_face in flr:
+            story_faces.extend(to_face3d(rm_face))
+        floor_faces.append(story_faces)
+    return floor_faces
 
 
 if all_required_inputs(ghenv.Component) and _run:
     perim_offset_ = 0 if perim_offset_ is None else perim_offset_
-    buildings = []  # list of buildings that will be returned
-    for i, geo in enumerate(_bldg_geo):
-        # get the name for the Building
+
+    # look up each of the unique programs and construction sets in the library once
+    if len(_program_) != 0:
+        _program_ = lookup_objects(_program_, program_type_by_identifier)
+    if len(_constr_set_) != 0:
+        _constr_set_ = lookup_objects(_constr_set_, construction_set_by_identifier)
+
+    # get the names of the Buildings
+    names, display_names = [], []
+    for i in range(len(_bldg_geo)):
         if len(_name_) == 0:  # make a default Building name
-            name = "Building_{}_{}".format(document_counter('bldg_count'),
-                                           str(uuid.uuid4())[:8])
+            names.append("Building_{}_{}".format(document_counter('bldg_count'),
+                                                 str(uuid.uuid4())[:8]))
         else:
             display_name = '{}_{}'.format(longest_list(_name_, i), i + 1)
-            name = clean_and_id_string(display_name)
-
-        # interpret the input _floor_to_floor information
-        min, max = geo_min_max_height(geo)
+            display_names.append(display_name)
+            names.append(clean_and_id_string(display_name))
+
+    # convert any Rhino extrusions or surfaces to polysurfaces
+    _bldg_geo = [geo.ToBrep() if hasattr(geo, 'ToBrep') else geo for geo in _bldg_geo]
+
+    # interpret the input _floor_to_floor information and get any cached floors
+    slice_cache = sc.sticky.get('df_solid_slices')
+    if slice_cache is None:
+        slice_cache = sc.sticky['df_solid_slices'] = OrderedDict()
+    slice_keys, all_floor_heights, all_f2f, floor_faces = [], [], [], []
+    for geo in _bldg_geo:
+        min_hgt, max_hgt = solid_min_max_height(geo)
         floor_heights, interpreted_f2f = interpret_floor_height_subdivide(
-            _floor_to_floor, max, min)
-
+            _floor_to_floor, max_hgt, min_hgt)
+        key = (solid_key(geo), tuple(floor_heights), tolerance)
+        slice_keys.append(key)
+        all_floor_heights.append(floor_heights)
+        all_f2f.append(interpreted_f2f)
+        floor_faces.append(slice_cache.get(key))
+
+    def create_building(i):
         # get the floor geometries of the building
-        floor_breps = split_solid_to_floors(geo, floor_heights)
-        floor_faces = []
-        for flr in floor_breps:
-            story_faces = []
-            for rm_face in flr:
-                story_faces.extend(to_face3d(rm_face))
-            floor_faces.append(story_faces)
+        if floor_faces[i] is None:  # the solid has not been sliced before
+            floor_faces[i] = slice_solid(_bldg_geo[i], all_floor_heights[i])
 
         # create the Building
         building = Building.from_all_story_geometry(
-            name, floor_faces, floor_to_floor_heights=interpreted_f2f,
+            names[i], floor_faces[i], floor_to_floor_heights=all_f2f[i],
             perimeter_offset=perim_offset_, tolerance=tolerance)
         if len(_name_) != 0:
-            building.display_name = display_name
+            building.display_name = display_names[i]
 
         # assign the program
         if len(_program_) != 0:
             program = longest_list(_program_, i)
-            if isinstance(program, str):
-                program = program_type_by_identifier(program)
             building.properties.energy.set_all_room_2d_program_type(program)
         else:  # generic office program by default
             try:
@@ -147,8 +224,6 @@ if all_required_inputs(ghenv.Component) and _run:
         # assign the construction set
         if len(_constr_set_) != 0:
             constr_set = longest_list(_constr_set_, i)
-            if isinstance(constr_set, str):
-                constr_set = construction_set_by_identifier(constr_set)
             building.properties.energy.construction_set = constr_set
 
         # assign an ideal air system
@@ -158,4 +233,15 @@ if all_required_inputs(ghenv.Component) and _run:
             except (NameError, AttributeError):
                 pass  # honeybee-energy is not installed
 
-        buildings.append(building)
+        buildings[i] = building
+
+    # slice the solids and create the Buildings, several at a time if possible
+    buildings = [None] * len(_bldg_geo)  # list of buildings that will be returned
+    run_in_parallel(create_building, len(_bldg_geo), _cpus_)
+
+    # cache the floors of the solids for the next time the component runs
+    for key, faces in zip(slice_keys, floor_faces):
+        slice_cache.pop(key, None)
+        slice_cache[key] = faces
+    while len(slice_cache) > SLICE_CACHE_SIZE:
+        slice_cache.popitem(last=False)  # drop the least recently used
@@ -0,0 +1,350 @@
+# Dragonfly: A Plugin for Environmental Analysis (GPL)
+# This file is part of Dragonfly.
+#
+# Copyright (c) 2020, Ladybug Tools.
+# You should have received a copy of the GNU General Public License
+# along with Dragonfly; If not, see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+
+"""
+Create Dragonfly Buildings from the footprint polygons of a geoJSON or a
+newline-delimited geoJSON file.
+_
+The file is read one feature at a time and the Buildings are created directly
+from the feature coordinates in chunks of several features at once, making this
+component suitable for city-scale footprint datasets without the need to import
+the footprints as Rhino geometry. Every Polygon and MultiPolygon feature without a
+"type" property or with a "type" of "Building" is converted to a Building.
+-
+
+    Args:
+        _geojson: The path to a geoJSON file with a FeatureCollection of building
+            footprints. Files with a .geojsonl, .geojsons, .ndjson or .jsonl
+            extension are read as newline-delimited geoJSON with one feature
+            on each line.
+        _location: A ladybug Location object possessing longitude and lattiude data
+            used to position the footprints in the Rhino scene.
+        _point_: A Point for where the _location object exists within the space of
+            the Rhino scene. (Default: Rhino origin (0, 0, 0)).
+        height_key_: Text for the feature property with the height of each
+            building in meters. (Default: maximum_roof_height).
+        stories_key_: Text for the feature property with the number of stories
+            of each building. (Default: number_of_stories).
+        _floor_to_floor_: A number for the floor-to-floor height of the stories,
+            which is used to get the number of stories of buildings that only
+            have a height and the height of buildings that only have a number
+            of stories. Buildings without either property are a single story
+            of this height. (Default: 3.5 meters).
+        _cpus_: A positive integer for the number of footprints to convert to
+            Buildings at once. (Default: all of the processors on the machine).
+        _run: Set to True to run the component and create Dragonfly Buildings.
+
+    Returns:
+        report: Reports, errors, warnings, etc.
+        buildings: Dragonfly Buildings for the footprints in the _geojson.
+"""
+
+ghenv.Component.Name = 'DF Buildings from geoJSON'
+ghenv.Component.NickName = 'BuildingsGeoJSON'
+ghenv.Component.Message = '1.1.1'
+ghenv.Component.Category = 'Dragonfly'
+ghenv.Component.SubCategory = '2 :: Serialize'
+ghenv.Component.AdditionalHelpFromDocStrings = '3'
+
+
+try:  # import the ladybug_geometry dependencies
+    from ladybug_geometry.geometry2d.pointvector import Point2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D, Vector3D
+    from ladybug_geometry.geometry3d.plane import Plane
+    from ladybug_geometry.geometry3d.face import Face3D
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug_geometry:\n\t{}'.format(e))
+
+try:  # import the ladybug dependencies
+    from ladybug.location import Location
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
+
+try:  # import the core honeybee dependencies
+    from honeybee.typing import clean_string
+except ImportError as e:
+    raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
+
+try:  # import the core dragonfly dependencies
+    from dragonfly.building import Building
+    from dragonfly.projection import meters_to_long_lat_factors, \
+        origin_long_lat_from_location, lon_lat_to_polygon
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly:\n\t{}'.format(e))
+
+try:
+    from ladybug_rhino.togeometry import to_point2d
+    from ladybug_rhino.config import tolerance, conversion_to_meters
+    from ladybug_rhino.grasshopper import all_required_inputs
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
+
+try:
+    from dragonfly_grasshopper.parallel import run_in_parallel
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+import os
+import re
+import json
+from itertools import islice
+
+
+NDJSON_EXTENSIONS = ('.geojsonl', '.geojsons', '.ndjson', '.jsonl')
+CHUNK_SIZE = 1000  # number of features that are converted to Buildings at once
+MAX_FEATURE_SIZE = 64 * 1024 * 1024  # number of characters allowed in one feature
+SEPARATORS = re.compile(r'[\s,]*')
+COLON = re.compile(r'\s*:\s*')
+TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|["{}\[\]]')  # strings and brackets
+SCALAR = re.compile(r'[^\s,:{}\[\]"]+')
+CLOSERS = {'{': '}', '[': ']'}
+
+
+def value_end(buffer, pos):
+    """Get the index in a buffer of text after the end of a JSON value.
+
+    Args:
+        buffer: Text that contains the JSON value.
+        pos: The index of the first character of the JSON value.
+
+    Returns:
+        The index after the last character of the value or None if the value
+        continues beyond the end of the buffer. A ValueError is raised if the
+        brackets of the value do not match.
+    """
+    if buffer[pos] not in '{["':  # a number, true, false or null
+        end = SCALAR.match(buffer, pos)
+        return end.end() if end is not None and end.end() < len(buffer) else None
+    closers = []
+    for token in TOKENS.finditer(buffer, pos):
+        text = token.group()
+        if text == '"':  # a string that continues beyond the end of the buffer
+            return None
+        if text in CLOSERS:
+            closers.append(CLOSERS[text])
+        elif text == '}' or text == ']':
+            if not closers or closers.pop() != text:
+                raise ValueError('Unexpected "{}".'.format(text))
+        if not closers:
+            return token.end()
+    return None
+
+
+def geojson_features(geojson, block_size=1024 * 1024):
+    """Generate the feature dictionaries of a geoJSON file one at a time.
+
+    Only a block of the file and the feature being decoded are in memory at
+    any time such that files much larger than the available memory can be read.
+    The features are found in the "features" key of the top-level object of a
+    FeatureCollection and each one is decoded as soon as its closing bracket
+    has been read, so an invalid feature raises an error without reading the
+    rest of the file.
+
+    Args:
+        geojson: The path to a geoJSON file with a FeatureCollection or a
+            newline-delimited geoJSON file with one feature on each line.
+        block_size: Integer for the number of characters read from the file at once.
+    """
+    with open(geojson) as inf:
+        if os.path.splitext(geojson)[-1].lower() in NDJSON_EXTENSIONS:
+            for line in inf:
+                line = line.strip().lstrip('\x1e')  # geoJSON text sequence separator
+                if line:
+                    yield json.loads(line)
+            return
+
+        def read_more(buffer, pos, limit, message):
+            """Drop the decoded part of the buffer and add the next block of the file."""
+            if len(buffer) - pos > limit:
+                raise ValueError('{}: {}'.format(message, geojson))
+            block = inf.read(block_size)
+            if not block:
+                raise ValueError('{}: {}'.format(message, geojson))
+            return buffer[pos:] + block, 0
+
+        # find the "features" key of the top-level object of the FeatureCollection
+        buffer = inf.read(block_size).lstrip(u'\ufeff')
+        pos = SEPARATORS.match(buffer).end()
+        if buffer[pos:pos + 1] != '{':
+            raise ValueError('The geoJSON is not a FeatureCollection: {}'.format(geojson))
+        pos += 1
+        no_features = 'No "features" were found in the geoJSON'
+        while True:
+            pos = SEPARATORS.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] != '"':
+                raise ValueError(no_features + ': {}'.format(geojson))
+            key_end = value_end(buffer, pos) if pos < len(buffer) else None
+            colon = COLON.match(buffer, key_end) if key_end is not None else None
+            if colon is None or colon.end() == len(buffer):
+                buffer, pos = read_more(buffer, pos, MAX_FEATURE_SIZE, no_features)
+                continue
+            if json.loads(buffer[pos:key_end]) == 'features':
+                if buffer[colon.end()] != '[':
+                    raise ValueError('The geoJSON "features" are not a list: {}'.format(
+                        geojson))
+                pos = colon.end() + 1
+                break
+            end = value_end(buffer, colon.end())  # skip the value of another key
+            if end is None:
+                buffer, pos = read_more(buffer, pos, MAX_FEATURE_SIZE, no_features)
+                continue
+            pos = end
+
+        # decode each feature of the array, reading more of the file as needed
+        index = 0
+        incomplete = 'The geoJSON ends before the end of its features'
+        while True:
+            pos = SEPARATORS.match(buffer, pos).end()
+            if pos == len(buffer):
+                buffer, pos = read_more(buffer, pos, 0, incomplete)
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                end = value_end(buffer, pos)
+                if end is None:  # the feature continues in the next block of the file
+                    buffer, pos = read_more(buffer, pos, MAX_FEATURE_SIZE, incomplete)
+                    continue
+                feature = json.loads(buffer[pos:end])
+            except ValueError as e:
+                raise ValueError('Feature {} of the geoJSON is not valid JSON: {}\n{}'
+                                 .format(index, geojson, e))
+            yield feature
+            index += 1
+            pos = end
+            if pos > block_size:  # drop the features that have been decoded
+                buffer, pos = buffer[pos:], 0
+
+
+def coordinates_to_face3d(coordinates, origin_lon_lat, convert_facs):
+    """Convert the geoJSON coordinates of a polygon to a horizontal Face3D in meters."""
+    boundary = lon_lat_to_polygon(coordinates[0], origin_lon_lat, convert_facs)
+    boundary = [Point3D(pt[0], pt[1], 0) for pt in boundary][:-1]
+    holes = None
+    if len(coordinates) > 1:
+        holes = []
+        for hole_coords in coordinates[1:]:
+            hole = lon_lat_to_polygon(hole_coords, origin_lon_lat, convert_facs)
+            holes.append([Point3D(pt[0], pt[1], 0) for pt in hole][:-1])
+    return Face3D(boundary, plane=Plane(n=Vector3D(0, 0, 1)), holes=holes)
+
+
+def number_property(properties, key):
+    """Get a positive number from the properties of a feature or None if it has none."""
+    try:
+        value = float(properties.get(key))
+    except (TypeError, ValueError):  # missing or not a number
+        return None
+    return value if value > 0 else None
+
+
+def story_heights(properties, height_key, stories_key, floor_to_floor):
+    """Get the floor-to-floor heights of a building from the properties of a feature."""
+    height = number_property(properties, height_key)
+    stories = number_property(properties, stories_key)
+    stories = int(round(stories)) if stories is not None and stories >= 1 else None
+    if height is not None and stories is not None:
+        return [height / stories] * stories
+    if height is not None:
+        stories = max(int(round(height / floor_to_floor)), 1)
+        return [height / stories] * stories
+    if stories is not None:
+        return [floor_to_floor] * stories
+    return [floor_to_floor]
+
+
+def is_building(feature):
+    """Check whether a geoJSON feature is a building footprint."""
+    geometry = feature.get('geometry')
+    if not geometry or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+        return False
+    properties = feature.get('properties') or {}
+    return properties.get('type', 'Building') == 'Building'
+
+
+def feature_to_building(feature, index, origin_lon_lat, convert_facs, height_key,
+                        stories_key, floor_to_floor, scale):
+    """Convert a geoJSON feature to a Dragonfly Building in the units of the scene.
+
+    Args:
+        feature: A geoJSON feature dictionary for a building footprint.
+        index: The index of the feature in the file, used for the Building
+            identifier of features without an id property.
+        origin_lon_lat: The longitude and latitude of the scene origin.
+        convert_facs: A tuple of factors to convert longitude and latitude to meters.
+        height_key: Text for the property with the height of the building.
+        stories_key: Text for the property with the number of stories.
+        floor_to_floor: The default floor-to-floor height in meters.
+        scale: The factor to convert from meters to the units of the scene.
+    """
+    properties = feature.get('properties') or {}
+    geometry = feature['geometry']
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' \
+        else geometry['coordinates']
+    footprint = [coordinates_to_face3d(coords, origin_lon_lat, convert_facs)
+                 for coords in polygons]
+    heights = story_heights(properties, height_key, stories_key, floor_to_floor)
+    if scale != 1:
+        footprint = [face.scale(scale) for face in footprint]
+        heights = [height * scale for height in heights]
+
+    bldg_id = properties.get('id')
+    bldg_id = clean_string(str(bldg_id)) if bldg_id is not None \
+        else 'Building_{}'.format(index)
+    building = Building.from_footprint(bldg_id, footprint, heights, tolerance=tolerance)
+    if 'name' in properties:
+        building.display_name = str(properties['name'])
+    return building
+
+
+if all_required_inputs(ghenv.Component) and _run:
+    # check the inputs and set defaults
+    assert os.path.isfile(_geojson), 'No geoJSON file was found at: {}'.format(_geojson)
+    assert isinstance(_location, Location), \
+        'Expected Ladybug Location object. Got {}.'.format(type(_location))
+    to_meters = conversion_to_meters()
+    point = to_point2d(_point_).scale(to_meters) if _point_ is not None \
+        else Point2D(0, 0)
+    height_key_ = 'maximum_roof_height' if height_key_ is None else height_key_
+    stories_key_ = 'number_of_stories' if stories_key_ is None else stories_key_
+    flr_to_flr = 3.5 if _floor_to_floor_ is None else _floor_to_floor_ * to_meters
+
+    # get the factors to convert longitude and latitude to meters
+    origin_lon_lat = origin_long_lat_from_location(_location, point)
+    meters_to_lon, meters_to_lat = meters_to_long_lat_factors(origin_lon_lat)
+    convert_facs = 1 / meters_to_lon, 1 / meters_to_lat
+
+    # convert the building features to Buildings, one chunk of features at a time
+    buildings, errors = [], []
+    features = (f for f in enumerate(geojson_features(_geojson)) if is_building(f[1]))
+    while True:
+        chunk = list(islice(features, CHUNK_SIZE))
+        if len(chunk) == 0:
+            break
+        results = [None] * len(chunk)
+
+        def convert_feature(i):
+            index, feature = chunk[i]
+            try:
+                results[i] = feature_to_building(
+                    feature, index, origin_lon_lat, convert_facs, height_key_,
+                    stories_key_, flr_to_flr, 1 / to_meters)
+            except Exception as e:  # invalid footprint geometry
+                results[i] = 'Feature {} could not be converted: {}'.format(index, e)
+
+        run_in_parallel(convert_feature, len(chunk), _cpus_)
+        for result in results:
+            if isinstance(result, Building):
+                buildings.append(result)
+            else:
+                errors.append(result)
+
+    print('{} Buildings were created from the geoJSON.'.format(len(buildings)))
+    if len(errors) != 0:
+        print('{} footprints were skipped:\n{}'.format(len(errors), '\n'.join(errors)))
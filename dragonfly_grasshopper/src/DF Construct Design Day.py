@@ -8,12 +8,15 @@
 # @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
 
 """
-Construct a design day from a set of parameters.
-
+Construct design days from a set of parameters.
+_
+Each input can be a list with one item for each design day (like the columns
+of a table) in order to construct many design days in a single solve. Lists
+of different lengths are matched with the last item of the shorter lists.
 -
 
     Args:
-        _name: The name of the DesignDay object.
+        _name: The names of the DesignDay objects.
         _day_type: Text indicating the type of design day (ie. 'SummerDesignDay',
             'WinterDesignDay' or other EnergyPlus days).
         _location: A Ladybug Location object describing the location of the design day.
@@ -31,14 +34,19 @@ Construct a design day from a set of parameters.
         _sky_properties: A list of properties describing the sky above.
             For ASHRAEClearSky this is a single value for clearness.
             For ASHRAETau, this is the tau_beam and tau_diffuse.
+            When several design days are constructed, this should have one
+            item for each design day and the tau_beam and tau_diffuse of an
+            ASHRAETau sky can be given as text separated by a comma (eg. '0.5, 2.1').
+            If all of the design days have an ASHRAETau sky, a list of only the
+            tau_beam and tau_diffuse numbers will be used for all design days.
         
     Returns:
-        _design_days: A DesignDay object to deconstruct.
+        _design_days: A list of DesignDay objects to deconstruct.
 """
 
 ghenv.Component.Name = "DF Construct Design Day"
 ghenv.Component.NickName = 'ConstrDesignDay'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "2"
@@ -51,25 +59,83 @@ except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
 try:
-    from ladybug_rhino.grasshopper import all_required_inputs
+    from ladybug_rhino.grasshopper import all_required_inputs, longest_list
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
 
-if all_required_inputs(ghenv.Component):
-    # set defaults for relevant items
-    if _dry_bulb_range_ is None:
-        _dry_bulb_range_ = 0
-    if _barometric_p_ is None:
-        _barometric_p_ = 101325
-    
-    # process the input date
+def parse_date(date_str, date_cache):
+    """Parse a Date from text, only parsing each distinct text once."""
     try:
-        date = Date.from_date_string(_date)
+        return date_cache[date_str]
+    except KeyError:
+        try:
+            date = Date.from_date_string(date_str)
+        except ValueError:
+            date = DateTime.from_date_time_string(date_str).date
+        date_cache[date_str] = date
+        return date
+
+
+def parse_sky_properties(sky_props):
+    """Get a list of numbers from a number or text of numbers separated by commas."""
+    try:
+        return [float(sky_props)]
     except ValueError:
-        date = DateTime.from_date_time_string(_date).date
-    
-    design_day = DesignDay.from_design_day_properties(
-        _name, _day_type, _location, date, _dry_bulb_max, _dry_bulb_range_,
-        _humidity_type, _humidity_value, _barometric_p_, _wind_speed, _wind_dir,
-        _sky_type, _sky_properties)
\ No newline at end of file
+        return [float(prop) for prop in str(sky_props).split(',')]
+
+
+# the number of sky properties of each type of sky
+SKY_PROPERTY_COUNTS = {'ASHRAEClearSky': 1, 'ASHRAETau': 2}
+
+
+def design_day_sky_properties(sky_types, sky_properties, row_count):
+    """Get the list of sky properties of each design day.
+
+    Args:
+        sky_types: The list of sky types from the _sky_type input.
+        sky_properties: The list of items from the _sky_properties input. This
+            is either one item for each design day or the numbers of a single
+            sky, which are used for all of the design days.
+        row_count: The number of design days.
+    """
+    props = [parse_sky_properties(prop) for prop in sky_properties]
+    types = [longest_list(sky_types, i) for i in range(row_count)]
+    if row_count == 1 or (len(props) == 2 and all(len(p) == 1 for p in props) and
+                          all(sky == 'ASHRAETau' for sky in types)):
+        shared = [val for p in props for val in p]  # the properties of a single sky
+        return [shared] * row_count
+
+    rows = [longest_list(props, i) for i in range(row_count)]
+    for i, (sky, row_props) in enumerate(zip(types, rows)):
+        count = SKY_PROPERTY_COUNTS.get(sky)
+        if count is not None and len(row_props) != count:
+            raise ValueError(
+                'The {} sky of design day {} must have {} sky properties. Got {}.\n'
+                'Give the tau_beam and tau_diffuse of an ASHRAETau sky as text '
+                'separated by a comma (eg. "0.5, 2.1").'.format(
+                    sky, i, count, len(row_props)))
+    return rows
+
+
+if all_required_inputs(ghenv.Component):
+    # set defaults for relevant items
+    _dry_bulb_range_ = _dry_bulb_range_ if len(_dry_bulb_range_) != 0 else [0]
+    _barometric_p_ = _barometric_p_ if len(_barometric_p_) != 0 else [101325]
+
+    # construct a design day for each row of the inputs
+    columns = (_name, _day_type, _location, _date, _dry_bulb_max, _dry_bulb_range_,
+               _humidity_type, _humidity_value, _barometric_p_, _wind_speed,
+               _wind_dir, _sky_type, _sky_properties)
+    row_count = max(len(col) for col in columns[:-1])
+    sky_props = design_day_sky_properties(_sky_type, _sky_properties, row_count)
+    design_day, date_cache = [], {}
+    for i in range(row_count):
+        date = parse_date(longest_list(_date, i), date_cache)
+        design_day.append(DesignDay.from_design_day_properties(
+            longest_list(_name, i), longest_list(_day_type, i),
+            longest_list(_location, i), date, longest_list(_dry_bulb_max, i),
+            longest_list(_dry_bulb_range_, i), longest_list(_humidity_type, i),
+            longest_list(_humidity_value, i), longest_list(_barometric_p_, i),
+            longest_list(_wind_speed, i), longest_list(_wind_dir, i),
+            longest_list(_sky_type, i), sky_props[i]))
@@ -49,27 +49,27 @@ hourly data.
 
 ghenv.Component.Name = "DF Create EPW"
 ghenv.Component.NickName = 'CreateEPW'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.5'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "1"
 
+import os
 import math
+import scriptcontext as sc
 
 try:
     from ladybug.epw import EPW
     from ladybug.wea import Wea
     from ladybug.datacollection import HourlyContinuousCollection
-    from ladybug.sunpath import Sunpath
     from ladybug.datatype.temperature import Temperature
-    from ladybug.datatype.fraction import Fraction, RelativeHumidity
+    from ladybug.datatype.fraction import Fraction
     from ladybug.datatype.speed import Speed
     from ladybug.datatype.angle import Angle
     from ladybug.datatype.energyflux import EnergyFlux
     from ladybug.datatype.illuminance import Illuminance
     from ladybug.datatype.pressure import Pressure
     from ladybug.datatype.distance import Distance
-    from ladybug.psychrometrics import rel_humid_from_db_dpt
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
@@ -78,26 +78,117 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.weather import EPW_FIELD_COUNT, solar_altitudes, \
+        relative_humidities
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+
+def check_inputs(inputs, is_leap_year):
+    """Check the headers of all connected data collections.
+
+    Args:
+        inputs: A list of tuples with five items for each input of the component.
+            The input name, the data collection (or None if it is not connected),
+            the EPW properties that it sets, the expected data type class (or None
+            if it should not be checked) and the expected unit.
+        is_leap_year: Boolean for whether the data should be for a leap year.
+
+    Returns:
+        A list of tuples with the EPW properties and values of each connected input.
+    """
+    input_values, a_period = [], None
+    for name, data_coll, props, data_type, unit in inputs:
+        if not data_coll:
+            continue
+        assert isinstance(data_coll, HourlyContinuousCollection), \
+            '{} must be an hourly continuous data collection. Got {}.'.format(
+                name, type(data_coll))
+        if a_period is None:  # fully check the first analysis period
+            a_period = data_coll.header.analysis_period
+            assert a_period.is_annual, '{} analysis_period must be annual. ' \
+                'Got {}'.format(name, a_period)
+            assert a_period.is_leap_year == is_leap_year, '{} analysis_period ' \
+                'is_leap_year must match that of the EPW.'.format(name)
+        else:  # the others only need to match the first
+            assert data_coll.header.analysis_period == a_period, '{} ' \
+                'analysis_period must match across input data collections. ' \
+                'Got {}.'.format(name, data_coll.header.analysis_period)
+        if data_type is not None:
+            assert isinstance(data_coll.header.data_type, data_type), \
+                '{} data_type is not {}. Got {}.'.format(
+                    name, data_type(), data_coll.header.data_type)
+            assert data_coll.header.unit == unit, '{} unit is not {}. ' \
+                'Got {}.'.format(name, unit, data_coll.header.unit)
+        input_values.append((props, data_coll.values))
+    return input_values
+
+
+def base_epw(epw_file):
+    """Get a copy of a base EPW, which is only parsed once for each file version.
 
-def check_data(name, data_coll, data_type, unit, is_leap_year):
-    assert isinstance(data_coll, HourlyContinuousCollection), \
-        '{} must be an hourly continuous data collection. Got {}.'.format(
-            name, type(data_coll))
-    assert data_coll.header.analysis_period.is_annual, '{} analysis_period must ' \
-        'be annual. Got {}'.format(header.analysis_period)
-    assert data_coll.header.analysis_period.is_leap_year == is_leap_year, \
-        '{} analysis_period must is_leap_year must match across input data collections.'
-    assert isinstance(data_coll.header.data_type, data_type), '{} data_type is not {}. '\
-        'Got {}.'.format(name, data_type(), data_coll.header.data_type)
-    assert data_coll.header.unit == unit, '{} unit is not {}. '\
-        'Got {}.'.format(name, unit, data_coll.header.unit)
-    return data_coll.values
+    The parsed EPW is cached in the sticky with the modification time of the
+    file and the returned copy can be edited without changing the cached EPW.
+    """
+    key = ('df_base_epw', os.path.abspath(epw_file), os.path.getmtime(epw_file))
+    try:
+        base_obj = sc.sticky[key]
+    except KeyError:
+        base_obj = EPW(epw_file)
+        base_obj.dry_bulb_temperature  # load all of the data
+        for old_key in list(sc.sticky.keys()):
+            if isinstance(old_key, tuple) and old_key[:2] == key[:2]:
+                sc.sticky.pop(old_key)  # remove outdated versions of the file
+        sc.sticky[key] = base_obj
+
+    epw_obj = EPW.from_missing_values(is_leap_year=base_obj.is_leap_year)
+    epw_obj.location = base_obj.location.duplicate()
+    epw_obj.metadata = dict(base_obj.metadata)
+    epw_obj.heating_design_condition_dictionary = \
+        dict(base_obj.heating_design_condition_dictionary)
+    epw_obj.cooling_design_condition_dictionary = \
+        dict(base_obj.cooling_design_condition_dictionary)
+    epw_obj.extreme_design_condition_dictionary = \
+        dict(base_obj.extreme_design_condition_dictionary)
+    epw_obj.extreme_hot_weeks = dict(base_obj.extreme_hot_weeks)
+    epw_obj.extreme_cold_weeks = dict(base_obj.extreme_cold_weeks)
+    epw_obj.typical_weeks = dict(base_obj.typical_weeks)
+    epw_obj.monthly_ground_temperature = dict(base_obj.monthly_ground_temperature)
+    epw_obj.daylight_savings_start = base_obj.daylight_savings_start
+    epw_obj.daylight_savings_end = base_obj.daylight_savings_end
+    epw_obj.comments_1 = base_obj.comments_1
+    epw_obj.comments_2 = base_obj.comments_2
+    for field in range(EPW_FIELD_COUNT):
+        epw_obj.import_data_by_field(field).values = \
+            base_obj.import_data_by_field(field).values
+    return epw_obj
+
+
+def annual_solar_altitudes(location, is_leap_year):
+    """Get the solar altitude in degrees for each hour of the year at a location.
+
+    Tables are cached in the sticky such that repeated EPWs for the same site
+    only compute them once.
+
+    Args:
+        location: A Ladybug Location object.
+        is_leap_year: Boolean to note whether the year is a leap year.
+    """
+    key = ('df_solar_altitudes', location.latitude, location.longitude,
+           location.time_zone, is_leap_year)
+    try:
+        return sc.sticky[key]
+    except KeyError:
+        moys = range(0, (8784 if is_leap_year else 8760) * 60, 60)
+        altitudes = sc.sticky[key] = tuple(solar_altitudes(location, moys, is_leap_year))
+        return altitudes
 
 
 if all_required_inputs(ghenv.Component) and _run:
     # initialize the EPW
     if base_epw_ is not None:
-        epw_obj = EPW(base_epw_)
+        epw_obj = base_epw(base_epw_)
         leap_yr = epw_obj.is_leap_year
     else:
         if _model_year_:
@@ -105,65 +196,47 @@ if all_required_inputs(ghenv.Component) and _run:
         else:
             leap_yr = False
         epw_obj = EPW.from_missing_values(is_leap_year=leap_yr)
-    
-    # assign data to the EPW
+
+    # check the data collections and assign their values to the EPW
     epw_obj.location = _location
-    if _dry_bulb_temp_:
-        epw_obj.dry_bulb_temperature.values = check_data(
-            '_dry_bulb_temp_', _dry_bulb_temp_, Temperature, 'C', leap_yr)
-    if _dew_point_temp_:
-        epw_obj.dew_point_temperature.values = check_data(
-            '_dew_point_temp_', _dew_point_temp_, Temperature, 'C', leap_yr)
-    if _wind_speed_:
-        epw_obj.wind_speed.values = check_data(
-            '_wind_speed_', _wind_speed_, Speed, 'm/s', leap_yr)
-    if _wind_direction_:
-        epw_obj.wind_direction.values = check_data(
-            '_wind_direction_', _wind_direction_, Angle, 'degrees', leap_yr)
-    if _direct_normal_rad_:
-        epw_obj.direct_normal_radiation.values = _direct_normal_rad_.values
-    if _diffuse_horiz_rad_:
-        epw_obj.diffuse_horizontal_radiation.values = _diffuse_horiz_rad_.values
-    if _horiz_infrared_rad_:
-        epw_obj.horizontal_infrared_radiation_intensity.values = check_data(
-            '_horiz_infrared_rad_', _horiz_infrared_rad_, EnergyFlux, 'W/m2', leap_yr)
-    if _direct_normal_ill_:
-        epw_obj.direct_normal_illuminance.values = check_data(
-            '_direct_normal_ill_', _direct_normal_ill_, Illuminance, 'lux', leap_yr)
-    if _diffuse_horiz_ill_:
-        epw_obj.diffuse_horizontal_illuminance.values = check_data(
-            '_diffuse_horiz_ill_', _diffuse_horiz_ill_, Illuminance, 'lux', leap_yr)
-    if _total_sky_cover_:
-        epw_obj.total_sky_cover.values = check_data(
-            '_total_sky_cover_', _total_sky_cover_, Fraction, 'tenths', leap_yr)
-        epw_obj.opaque_sky_cover.values = _total_sky_cover_.values
-    if _atmos_pressure_:
-        epw_obj.atmospheric_station_pressure.values = check_data(
-            '_atmos_pressure_', _atmos_pressure_, Pressure, 'Pa', leap_yr)
-    if _visibility_:
-        epw_obj.visibility.values = check_data(
-            '_visibility_', _visibility_, Distance, 'km', leap_yr)
-    if _ceiling_height_:
-        epw_obj.ceiling_height.values = check_data(
-            '_ceiling_height_', _ceiling_height_, Distance, 'm', leap_yr)
-    if _model_year_:
-        epw_obj.years.values = _model_year_.values
-    
+    inputs = (
+        ('_dry_bulb_temp_', _dry_bulb_temp_, ('dry_bulb_temperature',),
+         Temperature, 'C'),
+        ('_dew_point_temp_', _dew_point_temp_, ('dew_point_temperature',),
+         Temperature, 'C'),
+        ('_wind_speed_', _wind_speed_, ('wind_speed',), Speed, 'm/s'),
+        ('_wind_direction_', _wind_direction_, ('wind_direction',), Angle, 'degrees'),
+        ('_direct_normal_rad_', _direct_normal_rad_, ('direct_normal_radiation',),
+         None, None),
+        ('_diffuse_horiz_rad_', _diffuse_horiz_rad_, ('diffuse_horizontal_radiation',),
+         None, None),
+        ('_horiz_infrared_rad_', _horiz_infrared_rad_,
+         ('horizontal_infrared_radiation_intensity',), EnergyFlux, 'W/m2'),
+        ('_direct_normal_ill_', _direct_normal_ill_, ('direct_normal_illuminance',),
+         Illuminance, 'lux'),
+        ('_diffuse_horiz_ill_', _diffuse_horiz_ill_,
+         ('diffuse_horizontal_illuminance',), Illuminance, 'lux'),
+        ('_total_sky_cover_', _total_sky_cover_,
+         ('total_sky_cover', 'opaque_sky_cover'), Fraction, 'tenths'),
+        ('_atmos_pressure_', _atmos_pressure_, ('atmospheric_station_pressure',),
+         Pressure, 'Pa'),
+        ('_visibility_', _visibility_, ('visibility',), Distance, 'km'),
+        ('_ceiling_height_', _ceiling_height_, ('ceiling_height',), Distance, 'm'),
+        ('_model_year_', _model_year_, ('years',), None, None)
+    )
+    for props, values in check_inputs(inputs, leap_yr):
+        for prop in props:
+            getattr(epw_obj, prop).values = values
+
     # calculate properties that are derived from other inputs
     if _dry_bulb_temp_ and _dew_point_temp_:
-        rel_humid = HourlyContinuousCollection.compute_function_aligned(
-            rel_humid_from_db_dpt, [_dry_bulb_temp_, _dew_point_temp_],
-            RelativeHumidity(), '%')
-        epw_obj.relative_humidity.values = rel_humid.values
+        epw_obj.relative_humidity.values = relative_humidities(
+            _dry_bulb_temp_.values, _dew_point_temp_.values)
     if _direct_normal_rad_ and _diffuse_horiz_rad_:
         wea = Wea(_location, _direct_normal_rad_, _diffuse_horiz_rad_)
         epw_obj.global_horizontal_radiation.values = wea.global_horizontal_irradiance.values
     if _direct_normal_ill_ and _diffuse_horiz_ill_:
-        glob_horiz = []
-        sp = Sunpath.from_location(_location)
-        sp.is_leap_year = leap_yr
-        for dt, dni, dhi in zip(_direct_normal_ill_.datetimes,
-                _direct_normal_ill_, _diffuse_horiz_ill_):
-            sun = sp.calculate_sun_from_date_time(dt)
-            glob_horiz.append(dhi + dni * math.sin(math.radians(sun.altitude)))
-        epw_obj.global_horizontal_radiation.values = glob_horiz
+        altitudes = annual_solar_altitudes(_location, leap_yr)
+        glob_horiz = [dhi + dni * math.sin(math.radians(alt)) for dni, dhi, alt in zip(
+            _direct_normal_ill_.values, _diffuse_horiz_ill_.values, altitudes)]
+        epw_obj.global_horizontal_illuminance.values = glob_horiz
@@ -10,39 +10,87 @@
 """
 Calculate downwelling horizontal infrared radiation intensity from sky cover,
 dry bulb temperature, and dew point temperature.
+_
+Each input can be a list to compute the infrared for several stations or
+scenarios at once (eg. many morphed dry bulb temperatures with the same sky
+cover and dew point). Lists of different lengths are matched with the last
+item of the shorter lists.
 -
 
     Args:
-        _sky_cover: A value or data collection representing sky cover [tenths]
-        _dry_bulb: A value or data collection representing  dry bulb temperature [C]
-        _dew_point: A value or data collection representing dew point temperature [C]
+        _sky_cover: A list of values or data collections representing sky
+            cover [tenths]
+        _dry_bulb: A list of values or data collections representing dry bulb
+            temperature [C]
+        _dew_point: A list of values or data collections representing dew
+            point temperature [C]
     
     Returns:
-        horiz_infrared: A data collection or value indicating the downwelling
-            horizontal infrared radiation [W/m2]
+        horiz_infrared: A list of data collections or values indicating the
+            downwelling horizontal infrared radiation [W/m2]
 """
 
 ghenv.Component.Name = "DF Horizontal Infrared"
 ghenv.Component.NickName = 'HorizInfr'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "4"
 
 try:
     from ladybug.skymodel import calc_horizontal_infrared
-    from ladybug.datacollection import HourlyContinuousCollection
+    from ladybug.datacollection import HourlyContinuousCollection, \
+        HourlyDiscontinuousCollection, DailyCollection, MonthlyCollection, \
+        MonthlyPerHourCollection
     from ladybug.datatype.energyflux import HorizontalInfraredRadiationIntensity
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
 try:
-    from ladybug_rhino.grasshopper import all_required_inputs
+    from ladybug_rhino.grasshopper import all_required_inputs, longest_list
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.weather import sky_emissivities, horizontal_infrared
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+DATA_COLLECTIONS = (HourlyContinuousCollection, HourlyDiscontinuousCollection,
+                    DailyCollection, MonthlyCollection, MonthlyPerHourCollection)
+
+
+def input_values(value, count):
+    """Get a list of values from a data collection or a single number."""
+    if isinstance(value, DATA_COLLECTIONS):
+        return value.values
+    return [float(value)] * count
+
 
 if all_required_inputs(ghenv.Component):
-    horiz_infrared = HourlyContinuousCollection.compute_function_aligned(
-        calc_horizontal_infrared, [_sky_cover, _dry_bulb, _dew_point],
-        HorizontalInfraredRadiationIntensity(), 'W/m2')
+    horiz_infrared, emiss_cache = [], {}
+    for i in range(max(len(_sky_cover), len(_dry_bulb), len(_dew_point))):
+        sky_cover = longest_list(_sky_cover, i)
+        dry_bulb = longest_list(_dry_bulb, i)
+        dew_point = longest_list(_dew_point, i)
+        data_colls = [inp for inp in (sky_cover, dry_bulb, dew_point)
+                      if isinstance(inp, DATA_COLLECTIONS)]
+        if len(data_colls) == 0:  # all inputs are individual values
+            horiz_infrared.append(calc_horizontal_infrared(
+                float(sky_cover), float(dry_bulb), float(dew_point)))
+            continue
+
+        # compute the emissivity once for scenarios that share sky cover and dew point
+        HourlyContinuousCollection.are_collections_aligned(data_colls)
+        count = len(data_colls[0].values)
+        emiss_key = (id(sky_cover), id(dew_point), count)
+        try:
+            sky_emiss = emiss_cache[emiss_key]
+        except KeyError:
+            sky_emiss = sky_emissivities(
+                input_values(sky_cover, count), input_values(dew_point, count))
+            emiss_cache[emiss_key] = sky_emiss
+
+        ir_values = horizontal_infrared(sky_emiss, input_values(dry_bulb, count))
+        horiz_infrared.append(data_colls[0].get_aligned_collection(
+            ir_values, HorizontalInfraredRadiationIntensity(), 'W/m2'))
@@ -20,11 +20,18 @@ _
 Also note that this component does not actually set the walls that are next to one
 another to be adjacent. The "DF Solve Adjacency" component must be used for this
 after runing this component.
+_
+Only the Room2Ds with overlapping bounding rectangles are intersected with one
+another and groups of Room2Ds that do not touch any other Room2Ds are intersected
+in parallel.
 -
 
     Args:
         _room2ds: A list of Room2Ds for which adjacencent segments will be
             intersected.
+        _cpus_: A positive integer for the number of groups of touching Room2Ds
+            to intersect at once. Set to 1 to intersect the groups one at a time.
+            (Default: all of the processors on the machine).
         _run: Set to True to run the component.
     
     Returns:
@@ -35,12 +42,19 @@ after runing this component.
 
 ghenv.Component.Name = "DF Intersect Room2Ds"
 ghenv.Component.NickName = 'IntRoom2D'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "4"
 
 
+try:  # import the ladybug_geometry dependencies
+    from ladybug_geometry.geometry2d.polygon import Polygon2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.face import Face3D
+except ImportError as e:
+    raise ImportError('\nFailed to import ladybug_geometry:\n\t{}'.format(e))
+
 try:  # import the core dragonfly dependencies
     from dragonfly.room2d import Room2D
 except ImportError as e:
@@ -52,7 +66,127 @@ try:  # import the ladybug_rhino dependencies
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.parallel import run_in_parallel
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+
+def overlapping_pairs(polygons, tolerance):
+    """Get the pairs of polygons with bounding rectangles that overlap within a tolerance.
+
+    The pairs are found by sorting the polygons along the X axis and only checking
+    the polygons that overlap in X (sweep and prune) such that polygons far from
+    one another are never compared.
+
+    Returns:
+        A list with a sorted list for each polygon, which contains the indices
+        of the polygons after it in the input list that it overlaps.
+    """
+    order = sorted(range(len(polygons)), key=lambda i: polygons[i].min.x)
+    pairs = [[] for _ in polygons]
+    active = []  # polygons that may still overlap the next polygons along X
+    for i in order:
+        min_x = polygons[i].min.x
+        active = [j for j in active if polygons[j].max.x + 2 * tolerance >= min_x]
+        for j in active:
+            if Polygon2D.overlapping_bounding_rect(polygons[i], polygons[j], tolerance):
+                pairs[min(i, j)].append(max(i, j))
+        active.append(i)
+    return [sorted(others) for others in pairs]
+
+
+def polygon_groups(pairs):
+    """Get groups of polygon indices that only overlap other polygons in the group."""
+    parents = list(range(len(pairs)))
+
+    def root(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, others in enumerate(pairs):
+        for j in others:
+            parents[root(j)] = root(i)
+    groups = {}
+    for i in range(len(pairs)):
+        groups.setdefault(root(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def intersect_adjacency(room_2ds, tolerance, cpus=None):
+    """Intersect the line segments of Room2Ds to ensure matching walls.
+
+    This gives the same result as Room2D.intersect_adjacency but it only
+    intersects the polygons with overlapping bounding rectangles and it
+    intersects the groups of overlapping polygons in parallel.
+
+    Args:
+        room_2ds: A list of Room2Ds for which adjacent segments will be
+            intersected.
+        tolerance: The minimum difference between the coordinate values of two
+            faces at which they can be considered adjacent.
+        cpus: An integer for the number of groups of Room2Ds to intersect at once.
+
+    Returns:
+        A tuple of Room2Ds that have been intersected with one another.
+    """
+    # gather the polygons of all Room2D floors and holes in the same 2D space
+    master_plane = room_2ds[0].floor_geometry.plane
+    move_dists, is_holes, polygon_2ds = [], [], []
+    for room in room_2ds:
+        dist = master_plane.o.z - room.floor_height
+        move_dists.append(dist)
+        is_holes.append(False)
+        polygon_2ds.append(room.floor_geometry.boundary_polygon2d)
+        if room.floor_geometry.has_holes:
+            for hole in room.floor_geometry.hole_polygon2d:
+                move_dists.append(dist)
+                is_holes.append(True)
+                polygon_2ds.append(hole)
+
+    # intersect the polygons of each group of overlapping polygons
+    pairs = overlapping_pairs(polygon_2ds, tolerance)
+    groups = polygon_groups(pairs)
+
+    def intersect_group(g):
+        for i in groups[g]:
+            for j in pairs[i]:
+                polygon_2ds[i], polygon_2ds[j] = Polygon2D.intersect_segments(
+                    polygon_2ds[i], polygon_2ds[j], tolerance)
+
+    run_in_parallel(intersect_group, len(groups), cpus)
+
+    # convert the resulting coordinates back to 3D space
+    face_pts = []
+    for poly, dist, is_hole in zip(polygon_2ds, move_dists, is_holes):
+        pt_3d = [master_plane.xy_to_xyz(pt) for pt in poly]
+        if dist != 0:
+            pt_3d = [Point3D(pt.x, pt.y, pt.z - dist) for pt in pt_3d]
+        if not is_hole:
+            face_pts.append((pt_3d, []))
+        else:
+            face_pts[-1][1].append(pt_3d)
+
+    # rebuild all of the floor geometries of the input Room2Ds
+    intersected_rooms = []
+    for room, (boundary, holes) in zip(room_2ds, face_pts):
+        new_geo = Face3D(boundary, room.floor_geometry.plane,
+                         holes if len(holes) != 0 else None)
+        rebuilt_room = Room2D(
+            room.identifier, new_geo, room.floor_to_ceiling_height,
+            is_ground_contact=room.is_ground_contact,
+            is_top_exposed=room.is_top_exposed)
+        rebuilt_room.display_name = room.display_name
+        rebuilt_room.user_data = None if room.user_data is None else \
+            room.user_data.copy()
+        rebuilt_room._parent = room._parent
+        rebuilt_room._properties._duplicate_extension_attr(room._properties)
+        intersected_rooms.append(rebuilt_room)
+    return tuple(intersected_rooms)
+
 
 # add an compile toggle, set _compile to True to run the function
 if all_required_inputs(ghenv.Component) and _run:
-    int_room2ds = Room2D.intersect_adjacency(_room2ds, tolerance)
\ No newline at end of file
+    int_room2ds = intersect_adjacency(_room2ds, tolerance, _cpus_)
\ No newline at end of file
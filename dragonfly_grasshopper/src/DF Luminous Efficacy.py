@@ -9,7 +9,9 @@
 
 """
 Esimtate sky illuminance from the irradiance contained within a WEA object.
-
+_
+The Perez luminous efficacy model is evaluated for all daylight timesteps of
+the WEA at once, which keeps sub-hourly WEAs (eg. a timestep of 60) fast.
 -
 
     Args:
@@ -27,13 +29,22 @@ Esimtate sky illuminance from the irradiance contained within a WEA object.
 
 ghenv.Component.Name = "DF Luminous Efficacy"
 ghenv.Component.NickName = 'LumEff'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "4"
 
+import math
+from bisect import bisect_right
+
 try:
     from ladybug.wea import Wea
+    from ladybug.header import Header
+    from ladybug.datacollection import HourlyContinuousCollection, \
+        HourlyDiscontinuousCollection
+    from ladybug.datatype.illuminance import GlobalHorizontalIlluminance, \
+        DirectNormalIlluminance, DiffuseHorizontalIlluminance
+    from ladybug.datatype.luminance import ZenithLuminance
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
@@ -42,7 +53,119 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.weather import solar_altitudes
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+
+# Perez Table 1: upper bounds of the discrete sky clearness categories
+EPS_BOUNDS = (1.065, 1.23, 1.5, 1.95, 2.8, 4.5, 6.2)
+
+# Perez Table 4: luminous efficacy coefficients of each sky clearness category
+GLOB_LUM_EFF_COEFF = (
+    (96.63, -0.47, 11.50, -9.16), (107.54, 0.79, 1.79, -1.19),
+    (98.73, 0.70, 4.40, -6.95), (92.72, 0.56, 8.36, -8.31),
+    (86.73, 0.98, 7.10, -10.94), (88.34, 1.39, 6.06, -7.60),
+    (78.63, 1.47, 4.93, -11.37), (99.65, 1.86, -4.46, -3.15))
+DIR_LUM_EFF_COEFF = (
+    (57.20, -4.55, -2.98, 117.12), (98.99, -3.46, -1.21, 12.38),
+    (109.83, -4.90, -1.71, -8.81), (110.34, -5.84, -1.99, -4.56),
+    (106.36, -3.97, -1.75, -6.16), (107.19, -1.25, -1.51, -26.73),
+    (105.75, 0.77, -1.26, -34.44), (101.18, 1.58, -1.10, -8.29))
+DIFF_LUM_EFF_COEFF = (
+    (97.24, -0.46, 12.00, -8.91), (107.22, 1.15, 0.59, -3.95),
+    (104.97, 2.96, -5.52, -8.77), (102.39, 5.59, -13.95, -13.90),
+    (100.71, 5.94, -22.75, -23.74), (106.42, 3.83, -36.15, -28.83),
+    (141.88, 1.90, -53.24, -14.03), (152.23, 0.35, -45.27, -7.98))
+ZEN_LUM_EFF_COEFF = (
+    (40.86, 26.77, -29.59, -45.75), (26.58, 14.73, 58.46, -21.25),
+    (19.34, 2.28, 100.00, 0.25), (13.25, -1.39, 124.79, 15.66),
+    (14.47, -5.09, 160.09, 9.13), (19.76, -3.88, 154.61, -19.21),
+    (28.39, -9.67, 151.58, -69.39), (42.91, -19.62, 130.80, -164.08))
+
+
+def perez_illuminance(altitudes, ghis, dnis, dhis, dew_points):
+    """Estimate the illuminance components of aligned lists with the Perez model.
+
+    This evaluates the same equations as estimate_illuminance_from_irradiance
+    in the ladybug skymodel but for whole lists of daylight values at once.
+    All altitudes must be above 0 (when the sun is above the horizon).
+
+    Returns:
+        A tuple with lists of global horizontal illuminance, direct normal
+        illuminance, diffuse horizontal illuminance and zenith luminance.
+    """
+    zeniths = [math.radians(90 - alt) for alt in altitudes]
+    airmasses = [1.0 / (math.sin(math.radians(alt)) + 0.50572 *
+                        (((6.07995 + alt) ** - 1.6364))) for alt in altitudes]
+    dhis = [0.1 if dhi == 0 else dhi for dhi in dhis]
+    epss = [((dhi + dni) / dhi + 1.041 * zen ** 3) / (1 + 1.041 * zen ** 3)
+            for dhi, dni, zen in zip(dhis, dnis, zeniths)]
+    for eps, alt in zip(epss, altitudes):
+        if not eps >= 1:
+            raise ValueError('Error in sky luminous efficacy calculation\n'
+                             'eps: %f  altitude: %f' % (eps, alt))
+    categories = [bisect_right(EPS_BOUNDS, eps) for eps in epss]
+    deltas = [dhi * am / 1360 for dhi, am in zip(dhis, airmasses)]
+    ws = [math.exp(0.08 * dp - 0.075) for dp in dew_points]
+    cos_zens = [math.cos(zen) for zen in zeniths]
+    log_deltas = [math.log(delta) for delta in deltas]
+
+    # Eq 6, 8, 7 and 9
+    coeffs = [GLOB_LUM_EFF_COEFF[cat] for cat in categories]
+    gh_ill = [ghi * (a + b * w + c * cz + d * ld) for ghi, (a, b, c, d), w, cz, ld
+              in zip(ghis, coeffs, ws, cos_zens, log_deltas)]
+    coeffs = [DIR_LUM_EFF_COEFF[cat] for cat in categories]
+    dn_ill = [max(0, dni * (a + b * w + c * math.exp(5.73 * zen - 5) + d * delta))
+              for dni, (a, b, c, d), w, zen, delta
+              in zip(dnis, coeffs, ws, zeniths, deltas)]
+    coeffs = [DIFF_LUM_EFF_COEFF[cat] for cat in categories]
+    dh_ill = [dhi * (a + b * w + c * cz + d * ld) for dhi, (a, b, c, d), w, cz, ld
+              in zip(dhis, coeffs, ws, cos_zens, log_deltas)]
+    coeffs = [ZEN_LUM_EFF_COEFF[cat] for cat in categories]
+    z_lum = [dhi * (a + b * cz + c * math.exp(-3 * zen) + d * delta)
+             for dhi, (a, b, c, d), cz, zen, delta
+             in zip(dhis, coeffs, cos_zens, zeniths, deltas)]
+    return gh_ill, dn_ill, dh_ill, z_lum
+
 
 if all_required_inputs(ghenv.Component):
-    glob_ill, dir_ill, diff_ill, zen_lum = \
-        _wea.estimate_illuminance_components(_dew_point)
\ No newline at end of file
+    assert _dew_point.is_collection_aligned(_wea.direct_normal_irradiance), \
+        'Input _dew_point data must be aligned with the irradiance on the Wea.'
+
+    # get the solar altitude at each timestep of the Wea
+    moys = [dt.moy for dt in _wea.direct_normal_irradiance.datetimes]
+    if _wea.timestep == 1:  # hourly Wea values are for the middle of the hour
+        moys = [moy + 30 for moy in moys]
+    altitudes = solar_altitudes(_wea.location, moys, _wea.is_leap_year)
+
+    # estimate the illuminance when the sun is above the horizon
+    sun_up = [i for i, alt in enumerate(altitudes) if alt > 0]
+    up_alts = [altitudes[i] for i in sun_up]
+    dnis = _wea.direct_normal_irradiance.values
+    up_dnis = [dnis[i] for i in sun_up]
+    dhis = _wea.diffuse_horizontal_irradiance.values
+    up_dhis = [dhis[i] for i in sun_up]
+    up_ghis = [dhi + dni * math.sin(math.radians(alt))  # as Wea computes it
+               for dhi, dni, alt in zip(up_dhis, up_dnis, up_alts)]
+    dew_points = _dew_point.values
+    up_results = perez_illuminance(
+        up_alts, up_ghis, up_dnis, up_dhis, [dew_points[i] for i in sun_up])
+
+    # create the data collections of the results
+    results = []
+    data_types = ((GlobalHorizontalIlluminance(), 'lux'),
+                  (DirectNormalIlluminance(), 'lux'),
+                  (DiffuseHorizontalIlluminance(), 'lux'), (ZenithLuminance(), 'cd/m2'))
+    for (data_type, unit), up_values in zip(data_types, up_results):
+        values = [0] * len(altitudes)
+        for i, val in zip(sun_up, up_values):
+            values[i] = val
+        header = Header(data_type, unit, _wea.analysis_period, _wea.metadata)
+        if _wea.is_continuous:
+            results.append(HourlyContinuousCollection(header, values))
+        else:
+            results.append(HourlyDiscontinuousCollection(
+                header, values, _wea.direct_normal_irradiance.datetimes))
+    glob_ill, dir_ill, diff_ill, zen_lum = results
\ No newline at end of file
@@ -55,7 +55,7 @@ Convert a Dragonfly Model into a series of Honeybee Models.
 
 ghenv.Component.Name = 'DF Model To Honeybee'
 ghenv.Component.NickName = 'ToHoneybee'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.3'
 ghenv.Component.Category = 'Dragonfly'
 ghenv.Component.SubCategory = '2 :: Serialize'
 ghenv.Component.AdditionalHelpFromDocStrings = '3'
@@ -73,6 +73,11 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.translate import buildings_to_honeybee
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 
 if all_required_inputs(ghenv.Component) and _run:
     # set default inputs if not specified
@@ -85,6 +90,10 @@ if all_required_inputs(ghenv.Component) and _run:
         'Expected Dragonfly Model object. Got {}.'.format(type(_model))
 
     # create the model objects
-    hb_models = _model.to_honeybee(
-        _obj_per_model_, shade_dist_, use_multiplier_, add_plenum_,
-        tolerance=tolerance)
+    if _obj_per_model_.title() == 'Building':
+        hb_models = buildings_to_honeybee(
+            _model, shade_dist_, use_multiplier_, add_plenum_, tolerance)
+    else:
+        hb_models = _model.to_honeybee(
+            _obj_per_model_, shade_dist_, use_multiplier_, add_plenum_,
+            tolerance=tolerance)
@@ -42,6 +42,13 @@ key in the geoJSON.
         _folder_: Text for the full path to the folder where the geojson will be
             written along with all of the Honeybee Model JSONs. If None, the
             honeybee default simulation folder is used.
+        ndjson_: Boolean to note whether the geoJSON written when _write is 2
+            should be a newline-delimited geoJSON (.geojsonl) with one Building
+            feature on each line, which can be read by line-oriented tools
+            without loading the whole file. (Default: False).
+        _cpus_: A positive integer for the number of Buildings to translate
+            to Honeybee Models and write at once. (Default: all of the
+            processors on the machine).
         _write: Set to "True" to have the Dragonfly Model translated to an
             URBANopt-compatible geoJSON. This input can also be the integer "2",
             which will only create the geojson file but not create any honeybee
@@ -65,7 +72,7 @@ key in the geoJSON.
 
 ghenv.Component.Name = 'DF Model To geoJSON'
 ghenv.Component.NickName = 'ToGeoJSON'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.5'
 ghenv.Component.Category = 'Dragonfly'
 ghenv.Component.SubCategory = '2 :: Serialize'
 ghenv.Component.AdditionalHelpFromDocStrings = '3'
@@ -78,9 +85,15 @@ except ImportError as e:
 
 try:  # import the ladybug dependencies
     from ladybug.location import Location
+    from ladybug.futil import preparedir
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
+try:  # import the honeybee dependencies
+    from honeybee.config import folders
+except ImportError as e:
+    raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
+
 try:  # import the core dragonfly dependencies
     from dragonfly.model import Model
 except ImportError as e:
@@ -93,6 +106,13 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.translate import model_to_urbanopt, write_geojson
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
+import os
+
 
 if all_required_inputs(ghenv.Component) and _write:
     # set default inputs if not specified
@@ -107,9 +127,17 @@ if all_required_inputs(ghenv.Component) and _write:
         'Expected Ladybug Location object. Got {}.'.format(type(_location))
 
     if _write == 2:
-        geojson = _model.to_geojson(_location, point, _folder_, tolerance)
+        # write the geoJSON one Building at a time
+        folder = folders.default_simulation_folder if _folder_ is None else _folder_
+        project_folder = os.path.join(folder, _model.identifier)
+        preparedir(project_folder, remove_content=False)
+        ext = 'geojsonl' if ndjson_ else 'geojson'
+        geojson = write_geojson(
+            _model, _location, point,
+            os.path.join(project_folder, '{}.{}'.format(_model.identifier, ext)),
+            tolerance, ndjson=ndjson_)
     else:
         # create the geoJSON and honeybee Model JSONs
-        geojson, hb_jsons, hb_models = _model.to.urbanopt(
+        geojson, hb_jsons, hb_models = model_to_urbanopt(
             _model, _location, point, shade_dist_, use_multiplier_, add_plenum_,
-            _folder_, tolerance=tolerance)
+            _folder_, tolerance, _cpus_)
@@ -35,7 +35,7 @@ to such stories.
 
 ghenv.Component.Name = 'DF Reassign Energy Properties'
 ghenv.Component.NickName = 'ReassignProp'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = 'Dragonfly'
 ghenv.Component.SubCategory = '3 :: Energy'
 ghenv.Component.AdditionalHelpFromDocStrings = '2'
@@ -57,6 +57,11 @@ try:  # import the honeybee-energy extension
 except ImportError as e:
     raise ImportError('\nFailed to import honeybee_energy energy:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.library import lookup_objects
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:  # import the dragonfly-energy extension
     import dragonfly_energy
 except ImportError as e:
@@ -69,8 +74,7 @@ if all_required_inputs(ghenv.Component):
 
     # try to assign the program
     if program_ is not None:
-        if isinstance(program_, str):
-            program_ = program_type_by_identifier(program_)
+        program_ = lookup_objects([program_], program_type_by_identifier)[0]
         if isinstance(df_obj, (Building, Story)):
             df_obj.properties.energy.set_all_room_2d_program_type(program_)
         else:  # it's a Room2D
@@ -78,6 +82,5 @@ if all_required_inputs(ghenv.Component):
 
     # try to assign the construction set
     if constr_set_ is not None:
-        if isinstance(constr_set_, str):
-            constr_set_ = construction_set_by_identifier(constr_set_)
+        constr_set_ = lookup_objects([constr_set_], construction_set_by_identifier)[0]
         df_obj.properties.energy.construction_set = constr_set_
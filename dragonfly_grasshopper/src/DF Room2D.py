@@ -42,7 +42,7 @@ Create Dragonfly Room2Ds from floor plate geometry (horizontal Rhino surfaces).
 
 ghenv.Component.Name = "DF Room2D"
 ghenv.Component.NickName = 'Room2D'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "4"
@@ -65,6 +65,11 @@ try:  # import the ladybug_rhino dependencies
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.library import lookup_objects
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:  # import the dragonfly-energy extension
     import dragonfly_energy
     from honeybee_energy.lib.programtypes import program_type_by_identifier, \
@@ -85,6 +90,12 @@ import uuid
 
 
 if all_required_inputs(ghenv.Component):
+    # look up each of the unique programs and construction sets in the library once
+    if len(_program_) != 0:
+        _program_ = lookup_objects(_program_, program_type_by_identifier)
+    if len(_constr_set_) != 0:
+        _constr_set_ = lookup_objects(_constr_set_, construction_set_by_identifier)
+
     room2d = []  # list of room2ds that will be returned
     face3ds = [face for geo in _geo for face in to_face3d(geo)]  # convert to lb geo
     for i, geo in enumerate(face3ds):
@@ -103,8 +114,6 @@ if all_required_inputs(ghenv.Component):
         # assign the program
         if len(_program_) != 0:
             program = longest_list(_program_, i)
-            if isinstance(program, str):
-                program = program_type_by_identifier(program)
             room.properties.energy.program_type = program 
         else:  # generic office program by default
             try:
@@ -115,8 +124,6 @@ if all_required_inputs(ghenv.Component):
         # assign the construction set
         if len(_constr_set_) != 0:
             constr_set = longest_list(_constr_set_, i)
-            if isinstance(constr_set, str):
-                constr_set = construction_set_by_identifier(constr_set)
             room.properties.energy.construction_set = constr_set
 
         # assign an ideal air system
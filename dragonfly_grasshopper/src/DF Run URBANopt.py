@@ -13,6 +13,12 @@ _
 This component requires the URBANopt CLI to be installed in order to run.
 Installation instructions for the URBANopt CLI can be found at:
 https://docs.urbanopt.net/installation/installation.html
+_
+The run folder of each building (with all of its results and reports) is cached
+in the default simulation folder along with a hash of the building's honeybee
+Model, the simulation parameters, the EPW, the measures and report_. Buildings
+for which none of these have changed since a previous run reuse the cached
+results and are not simulated again.
 -
 
     Args:
@@ -31,8 +37,19 @@ https://docs.urbanopt.net/installation/installation.html
             measure as part of the simulation. If True, the measure will be run
             after all simulations are complete.
         _cpus_: A positive integer for the number of CPUs to use in the simulation.
-            This should be changed based on the machine on which the simulation
-            is being run in order to yield the fastest simulation (Default: 2).
+            Each building feature is simulated as a separate job and this is
+            the number of jobs that run at once. (Default: the number of
+            processors on the machine minus one).
+        background_: Boolean to note whether the simulation should run in the
+            background such that Rhino and Grasshopper remain usable while it
+            runs. If True, the component checks the simulation every few seconds,
+            reporting the status and elapsed time of each feature, and outputs
+            the results once the simulation is done. (Default: False).
+        resume_: Boolean to note whether the simulation should resume from a
+            previous run that failed or was interrupted. If True, only the
+            features without a finished simulation in the project folder will
+            be simulated and the results of all features will be output. (Default:
+            False).
         _run: Set to "True" to run the geojson through URBANopt.
             This will ensure that all result files appear in their respective
             outputs from this component. This input can also be the integer "2",
@@ -54,16 +71,23 @@ https://docs.urbanopt.net/installation/installation.html
             possible outputs that can be requested from the EnergyPlus model. Use the
             "Read Result Dictionary" component to see what outputs can be requested.
         html: File paths of the HTMLs containting all Summary Reports.
+        err: File paths of the .err files containing all errors and warnings
+            from the simulation of each feature.
 """
 
 ghenv.Component.Name = 'DF Run URBANopt'
 ghenv.Component.NickName = 'RunURBANopt'
-ghenv.Component.Message = '1.1.1'
+ghenv.Component.Message = '1.1.7'
 ghenv.Component.Category = 'Dragonfly'
 ghenv.Component.SubCategory = '3 :: Energy'
 ghenv.Component.AdditionalHelpFromDocStrings = '1'
 
 
+try:
+    from honeybee.config import folders
+except ImportError as e:
+    raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
+
 try:
     from honeybee_energy.simulation.parameter import SimulationParameter
 except ImportError as e:
@@ -75,6 +99,13 @@ try:  # import the dragonfly_energy dependencies
 except ImportError as e:
     raise ImportError('\nFailed to import dragonfly_energy:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.urbanopt import feature_folder, feature_status, \
+        feature_results, clear_feature, scenario_features, write_scenario, \
+        start_urbanopt, poll, progress, collect
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:
     from ladybug_rhino.grasshopper import all_required_inputs
 except ImportError as e:
@@ -82,9 +113,136 @@ except ImportError as e:
 
 import os
 import json
+import shutil
+import hashlib
+import scriptcontext as sc
+
+try:  # get the number of processors on the machine
+    from System import Environment
+    CPU_COUNT = Environment.ProcessorCount
+except ImportError:  # not running in .NET
+    import multiprocessing
+    CPU_COUNT = multiprocessing.cpu_count()
+
+
+URBANOPT_CACHE_FOLDER = os.path.join(folders.default_simulation_folder, 'urbanopt_cache')
+URBANOPT_CACHE_SIZE = 5 * 1024 * 1024 * 1024  # bytes above which old results are evicted
+
+
+def file_hash(file_path):
+    """Get the sha1 hash of the contents of a file."""
+    f_hash = hashlib.sha1()
+    with open(file_path, 'rb') as inf:
+        for block in iter(lambda: inf.read(1024 * 1024), b''):
+            f_hash.update(block)
+    return f_hash.hexdigest()
+
+
+def feature_cache_keys(geojson, sim_par_dict, epw_file, measures, report):
+    """Get the cache keys of the building features in an URBANopt geoJSON.
+
+    Each key is a hash of the honeybee Model JSON of the building together with
+    all inputs that are shared by the features such that a feature only gets
+    a new key when something that affects its simulation has changed.
+
+    Returns:
+        A dictionary with the IDs of the building features as keys and their
+        cache keys as values. Features without a honeybee Model JSON are excluded.
+    """
+    measure_data = [] if measures is None else \
+        [(m.to_osw_dict(True), file_hash(m.program_file)) for m in measures]
+    shared = json.dumps([sim_par_dict, file_hash(epw_file), measure_data, report],
+                        sort_keys=True)
+    with open(geojson) as inf:
+        geojson_dict = json.load(inf)
+    keys = {}
+    for feature in geojson_dict['features']:
+        props = feature['properties']
+        hb_json = props.get('detailed_model_filename')
+        if props['type'] == 'Building' and hb_json and os.path.isfile(hb_json):
+            f_hash = hashlib.sha1(shared.encode('utf-8'))
+            f_hash.update(file_hash(hb_json).encode('utf-8'))
+            keys[props['id']] = f_hash.hexdigest()
+    return keys
+
+
+def restore_cached_feature(directory, feature_id, key):
+    """Replace the run folder of a feature with its cached run folder.
+
+    Returns:
+        True if the feature was found in the cache and its results were
+        restored. False if the feature has no cached results.
+    """
+    cache_dir = os.path.join(URBANOPT_CACHE_FOLDER, key)
+    if not os.path.isfile(os.path.join(cache_dir, 'finished.job')):
+        return False
+    clear_feature(directory, feature_id)
+    shutil.copytree(cache_dir, feature_folder(directory, feature_id))
+    os.utime(cache_dir, None)  # mark the entry as recently used
+    return True
+
+
+def folder_size(folder):
+    """Get the size in bytes of all files in a folder and its sub-folders."""
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(folder) for f in files)
+
+
+def cache_feature(directory, feature_id, key):
+    """Copy the whole run folder of a finished feature into the cache.
+
+    The folder is copied next to the cache entry and then renamed such that
+    incomplete copies are never restored. The least recently used entries are
+    removed from the cache until the cache is smaller than URBANOPT_CACHE_SIZE.
+    """
+    cache_dir = os.path.join(URBANOPT_CACHE_FOLDER, key)
+    part_dir = cache_dir + '.tmp'
+    for old_dir in (part_dir, cache_dir):
+        if os.path.isdir(old_dir):
+            shutil.rmtree(old_dir)
+    shutil.copytree(feature_folder(directory, feature_id), part_dir)
+    os.rename(part_dir, cache_dir)
+
+    # evict the least recently used entries
+    entries = []
+    for entry in os.listdir(URBANOPT_CACHE_FOLDER):
+        entry_dir = os.path.join(URBANOPT_CACHE_FOLDER, entry)
+        if os.path.isdir(entry_dir) and not entry.endswith('.tmp'):
+            entries.append(
+                (os.path.getmtime(entry_dir), folder_size(entry_dir), entry_dir))
+    cache_size = sum(entry[1] for entry in entries)
+    for _, size, entry_dir in sorted(entries):
+        if cache_size <= URBANOPT_CACHE_SIZE or entry_dir == cache_dir:
+            break
+        cache_size -= size
+        shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def write_if_changed(file_path, text):
+    """Write text to a file only if the file does not already have the same text."""
+    if os.path.isfile(file_path):
+        with open(file_path) as inf:
+            if inf.read() == text:
+                return file_path
+    with open(file_path, 'w') as outf:
+        outf.write(text)
+    return file_path
+
 
+POLL_INTERVAL = 5000  # milliseconds between checks of a background simulation
 
-if all_required_inputs(ghenv.Component) and _run:
+
+def check_again(document):
+    """Expire the component such that a background simulation is checked again."""
+    ghenv.Component.ExpireSolution(False)
+
+
+def urbanopt_job(feature_geojson):
+    """Get the background simulation running for a geoJSON or None if there is none."""
+    return sc.sticky.get(('df_urbanopt_job', os.path.dirname(feature_geojson)))
+
+
+if all_required_inputs(ghenv.Component) and _run and urbanopt_job(_geojson) is None:
     # check that the EPW and geoJSON files exists
     assert os.path.isfile(_epw_file), \
         'No EPW file was found at: {}'.format(_epw_file)
@@ -110,9 +268,8 @@ if all_required_inputs(ghenv.Component) and _run:
 
     # write the simulation parameter JSONs
     sim_par_dict = _sim_par_.to_dict()
-    sim_par_json = os.path.join(directory, 'simulation_parameter.json')
-    with open(sim_par_json, 'w') as fp:
-        json.dump(sim_par_dict, fp)
+    sim_par_json = write_if_changed(os.path.join(directory, 'simulation_parameter.json'),
+                                    json.dumps(sim_par_dict))
 
     # write the base OSW to be used to translate all geoJSON features
     measures = None if len(measures_) == 0 or measures_[0] is None else measures_
@@ -122,9 +279,76 @@ if all_required_inputs(ghenv.Component) and _run:
         epw_file=_epw_file, skip_report=skip_report)
 
     # prepare the URBANopt folder and generate the scenario
-    _cpus_ = 2 if _cpus_ is None else _cpus_
+    _cpus_ = max(CPU_COUNT - 1, 1) if _cpus_ is None else _cpus_
     scenario = prepare_urbanopt_folder(_geojson, _cpus_)
 
     # execute the simulation with URBANopt CLI
     if _run == 1:
-        osm, idf, sql, zsz, rdd, html, err = run_urbanopt(_geojson, scenario)
+        header, features = scenario_features(scenario)
+
+        # reuse the cached results of the features that have not changed and only
+        # simulate the others after removing the results of their previous run
+        keys = feature_cache_keys(
+            _geojson, sim_par_dict, _epw_file, measures, skip_report)
+        pending, cached = [], 0
+        for row in features:
+            if resume_ and feature_status(directory, row[0]) == 'finished':
+                continue
+            if row[0] in keys and \
+                    restore_cached_feature(directory, row[0], keys[row[0]]):
+                cached += 1
+                continue
+            clear_feature(directory, row[0])
+            pending.append(row)
+        if len(pending) != len(features):
+            write_scenario(scenario, header, pending)
+        if cached != 0:
+            print('Reused the cached results of {} unchanged features.'.format(cached))
+
+        if background_ and len(pending) != 0:
+            print('Starting the simulation of {} of {} features with {} CPUs.'.format(
+                len(pending), len(features), _cpus_))
+            job = start_urbanopt(_geojson, scenario, [
+                (row[0], row[1] if len(row) > 1 else row[0]) for row in features])
+            job['keys'] = keys
+            sc.sticky[('df_urbanopt_job', directory)] = job
+        else:
+            if len(pending) != 0:
+                print('Simulating {} of {} features with {} CPUs.'.format(
+                    len(pending), len(features), _cpus_))
+                run_urbanopt(_geojson, scenario)
+                for row in pending:  # cache the results of the finished features
+                    if row[0] in keys and \
+                            feature_status(directory, row[0]) == 'finished':
+                        cache_feature(directory, row[0], keys[row[0]])
+            else:
+                print('All {} features have already been simulated.'.format(
+                    len(features)))
+
+            # output the results and report the status of each feature
+            feature_ids = [row[0] for row in features]
+            osm, idf, sql, zsz, rdd, html, err = feature_results(directory, feature_ids)
+            for row in features:
+                print('{} ({}): {}'.format(
+                    row[1] if len(row) > 1 else row[0], row[0],
+                    feature_status(directory, row[0])))
+
+if all_required_inputs(ghenv.Component) and _run and urbanopt_job(_geojson) is not None:
+    # check the progress of the simulation running in the background
+    job = urbanopt_job(_geojson)
+    directory = job['directory']
+    exit_code = poll(job)
+    for line in progress(job):
+        print(line)
+    if exit_code is None:  # still running; check again later
+        ghenv.Component.OnPingDocument().ScheduleSolution(POLL_INTERVAL, check_again)
+        feature_ids = [feature[0] for feature in job['features']]
+        osm, idf, sql, zsz, rdd, html, err = feature_results(directory, feature_ids)
+    else:  # the simulation is done; cache the results and release the job
+        for feature_id in job['pending']:
+            if feature_id in job['keys'] and \
+                    feature_status(directory, feature_id) == 'finished':
+                cache_feature(directory, feature_id, job['keys'][feature_id])
+        del sc.sticky[('df_urbanopt_job', directory)]
+        print('Simulation finished with exit code {}.'.format(exit_code))
+        osm, idf, sql, zsz, rdd, html, err = collect(job)
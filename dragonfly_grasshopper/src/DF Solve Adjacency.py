@@ -12,6 +12,10 @@ Solve adjacencies between a series of dragonfly Room2Ds.
 _
 Note that rooms must have matching edge segments in order for them to be discovered
 as adjacent.
+_
+The wall segments are placed in a grid by their end points such that each segment
+is only compared to the few segments that share its end points, allowing large
+floor plates with thousands of rooms to be solved quickly.
 -
 
     Args:
@@ -19,18 +23,24 @@ as adjacent.
         _run: Set to True to run the component and solve adjacencies.
     
     Returns:
-        report: Reports, errors, warnings, etc.
+        report: Reports, errors, warnings, etc. This includes the wall
+            segments that were set adjacent to one another.
         adj_room2ds: The input Room2Ds but with adjacencies solved for between
             segments.
 """
 
 ghenv.Component.Name = "DF Solve Adjacency"
 ghenv.Component.NickName = 'SolveAdj2D'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.1'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "4"
 
+try:  # import the core honeybee dependencies
+    from honeybee.boundarycondition import Surface
+except ImportError as e:
+    raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
+
 try:  # import the core dragonfly dependencies
     from dragonfly.room2d import Room2D
 except ImportError as e:
@@ -43,8 +53,88 @@ except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
 
+import math
+
+
+def grid_cell(point, tolerance):
+    """Get the cell of a grid with the size of the tolerance that contains a point."""
+    return int(math.floor(point.x / tolerance)), int(math.floor(point.y / tolerance))
+
+
+def segment_grid(all_segments, tolerance):
+    """Get a dictionary with the wall segments that have an end point in each grid cell.
+
+    Args:
+        all_segments: A list with a list of LineSegment2D for each Room2D.
+        tolerance: The size of the grid cells.
+    """
+    grid = {}
+    for i, segments in enumerate(all_segments):
+        for k, seg in enumerate(segments):
+            for pt in (seg.p1, seg.p2):
+                grid.setdefault(grid_cell(pt, tolerance), set()).add((i, k))
+    return grid
+
+
+def segments_near_point(grid, point, tolerance):
+    """Get a set of the (room index, segment index) with an end point near a point."""
+    x, y = grid_cell(point, tolerance)
+    near = set()
+    for cell in ((x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+        near.update(grid.get(cell, ()))
+    return near
+
+
+def solve_adjacency(room_2ds, tolerance):
+    """Solve for adjacencies between Room2Ds by only comparing nearby wall segments.
+
+    Candidate segments are those with both end points in the grid cells around
+    the end points of each segment. They are then checked in the same order
+    and with the same criteria as Room2D.solve_adjacency such that the result
+    is the same for Room2Ds with matching wall segments.
+
+    Args:
+        room_2ds: A list of Room2Ds for which adjacencies will be solved.
+        tolerance: The minimum difference between the coordinate values of two
+            segments at which they can be considered adjacent.
+
+    Returns:
+        A list of tuples with each tuple containing 2 sub-tuples for wall
+        segments paired in the process of solving adjacency. Sub-tuples have
+        the Room2D as the first item and the index of the adjacent wall as the
+        second item.
+    """
+    all_segments = [room.floor_segments_2d for room in room_2ds]
+    grid = segment_grid(all_segments, tolerance)
+    adj_info = []
+    for i, room_1 in enumerate(room_2ds):
+        for j, seg_1 in enumerate(all_segments[i]):
+            candidates = segments_near_point(grid, seg_1.p1, tolerance) & \
+                segments_near_point(grid, seg_1.p2, tolerance)
+            matched_rooms = set()  # each other room gets only one matching segment
+            for m, k in sorted(candidates):
+                if m <= i or m in matched_rooms:
+                    continue
+                room_2 = room_2ds[m]
+                if isinstance(room_2.boundary_conditions[k], Surface):
+                    continue  # the segment is already adjacent to another room
+                seg_2 = all_segments[m][k]
+                if seg_1.distance_to_point(seg_2.p1) <= tolerance and \
+                        seg_1.distance_to_point(seg_2.p2) <= tolerance:
+                    room_1.set_adjacency(room_2, j, k)
+                    adj_info.append(((room_1, j), (room_2, k)))
+                    matched_rooms.add(m)
+    return adj_info
+
+
 if all_required_inputs(ghenv.Component) and _run:
     adj_room2ds = [room.duplicate() for room in _room2ds] # duplicate the initial objects
-    
+
     # solve adjacnecy
-    Room2D.solve_adjacency(adj_room2ds, tolerance)
+    adj_info = solve_adjacency(adj_room2ds, tolerance)
+
+    # report the wall segments that were set adjacent to one another
+    print('{} pairs of wall segments were set adjacent.'.format(len(adj_info)))
+    for (room_1, seg_1), (room_2, seg_2) in adj_info:
+        print('"{}" wall {} <> "{}" wall {}'.format(
+            room_1.display_name, seg_1 + 1, room_2.display_name, seg_2 + 1))
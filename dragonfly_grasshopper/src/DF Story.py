@@ -42,7 +42,7 @@ Create a Dragonfly Story from individual Dragonfly Room2D objects.
 
 ghenv.Component.Name = "DF Story"
 ghenv.Component.NickName = 'Story'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '0 :: Create'
 ghenv.Component.AdditionalHelpFromDocStrings = "3"
@@ -63,6 +63,11 @@ try:  # import the core ladybug_rhino dependencies
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.library import lookup_objects
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:  # import the dragonfly-energy extension
     import dragonfly_energy
     from honeybee_energy.lib.constructionsets import construction_set_by_identifier
@@ -94,6 +99,6 @@ if all_required_inputs(ghenv.Component):
 
     # assign the construction set
     if _constr_set_ is not None:
-        if isinstance(_constr_set_, str):
-            _constr_set_ = construction_set_by_identifier(_constr_set_)
+        _constr_set_ = lookup_objects(
+            [_constr_set_], construction_set_by_identifier)[0]
         story.properties.energy.construction_set = _constr_set_
\ No newline at end of file
@@ -9,25 +9,31 @@
 
 """
 Write Ladybug DesignDays a standard .ddy file.
-
+_
+If the design days are for several different locations (eg. the design days
+of every station in a region), one .ddy file will be written for each location
+in a single pass.
 -
 
     Args:
         _location: A Ladybug Location object describing the location data in the
-            weather file.
+            weather file. This is only used when all of the _design_days
+            are for the same location.
         _design_days: A list of DesignDay objects representing the design days
             contained within the ddy file.
         _folder_: An optional folder to save the .ddy file.
-        _name_: An optional name for this .ddy file.
+        _name_: An optional name for this .ddy file. When the design days are for
+            several locations, the city of each location will be appended
+            to this name.
         _run: Set to "True" to run the component and write the .ddy file.
         
     Returns:
-        ddy_file: A .ddy file path that has been written to your system.
+        ddy_file: The .ddy file paths that have been written to your system.
 """
 
 ghenv.Component.Name = "DF Write DDY"
 ghenv.Component.NickName = 'WriteDDY'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.2'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "2"
@@ -35,26 +41,75 @@ ghenv.Component.AdditionalHelpFromDocStrings = "2"
 import os
 
 try:
-    from ladybug.ddy import DDY
+    from ladybug.futil import write_to_file
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
+try:
+    from honeybee.typing import clean_string
+except ImportError as e:
+    raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
+
 try:
     from ladybug_rhino.grasshopper import all_required_inputs
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug_rhino:\n\t{}'.format(e))
 
 
+def location_file_name(name, city, used_names):
+    """Get a unique file name for the design days of a city.
+
+    Args:
+        name: Text for the start of the file name.
+        city: Text for the city of the location, which will be cleaned of
+            spaces and special characters.
+        used_names: A set of the lower case file names that are already used,
+            which will be updated with the new name.
+    """
+    try:
+        city = clean_string(city.replace(' ', '_')[:100])
+    except AssertionError:  # the city has no valid characters
+        city = 'location'
+    f_name = base_name = '{}_{}'.format(name, city)
+    count = 1
+    while f_name.lower() in used_names:  # several stations in the same city
+        f_name = '{}_{}'.format(base_name, count)
+        count += 1
+    used_names.add(f_name.lower())
+    return f_name
+
+
 if all_required_inputs(ghenv.Component) and _run:
     # default folder and file name
     if _folder_ is None:
         _folder_ = os.path.join(os.environ['USERPROFILE'], 'ladybug')
     if _name_ is None:
         _name_ = 'unnamed.ddy'
-    if not _name_.lower().endswith('.ddy'):
-        _name_ = _name_ + '.ddy'
-    ddy_file = os.path.join(_folder_, _name_)
-    
-    # write the DDY file
-    ddy_obj = DDY(_location, _design_days)
-    ddy_obj.save(ddy_file)
\ No newline at end of file
+    if _name_.lower().endswith('.ddy'):
+        _name_ = _name_[:-4]
+
+    # group the design days by their location
+    loc_keys, location_ddys = [], {}
+    for d_day in _design_days:
+        loc = d_day.location
+        loc_key = (loc.city, loc.latitude, loc.longitude, loc.time_zone, loc.elevation)
+        try:
+            location_ddys[loc_key].append(d_day)
+        except KeyError:
+            loc_keys.append(loc_key)
+            location_ddys[loc_key] = [d_day]
+
+    # write a DDY file for each location
+    if len(loc_keys) <= 1:
+        file_ddys = [(_name_, _location, _design_days)]
+    else:
+        file_ddys, f_names = [], set()
+        for loc_key in loc_keys:
+            d_days = location_ddys[loc_key]
+            f_name = location_file_name(_name_, loc_key[0], f_names)
+            file_ddys.append((f_name, d_days[0].location, d_days))
+    ddy_file = []
+    for f_name, location, d_days in file_ddys:
+        data = [location.to_idf()] + [d_day.to_idf() for d_day in d_days]
+        ddy_path = os.path.join(_folder_, f_name + '.ddy')
+        ddy_file.append(write_to_file(ddy_path, '\n\n'.join(data) + '\n\n', True))
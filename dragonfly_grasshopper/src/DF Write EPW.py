@@ -17,17 +17,19 @@ Write an EPW object into a .epw file.
         _folder_: A directory into which the .epw file will be written.
         _file_name_: An optional name for the .epw file. Default will use the
             city of the EPW object's location.
+        compress_: Set to True to write the .epw file compressed with gzip
+            (with a .epw.gz extension). (Default: False).
         _run: Set to True to run the component and write the .epw file.
     
     Returns:
         report: Reports, errors, warnings, etc.
         epw_file: File path to a .epw that contains all of the data in the
-            input _epw_obj.
+            input _epw_obj. This will be a .epw.gz file if compress_ is True.
 """
 
 ghenv.Component.Name = "DF Write EPW"
 ghenv.Component.NickName = 'WriteEPW'
-ghenv.Component.Message = '1.1.0'
+ghenv.Component.Message = '1.1.3'
 ghenv.Component.Category = "Dragonfly"
 ghenv.Component.SubCategory = '4 :: AlternativeWeather'
 ghenv.Component.AdditionalHelpFromDocStrings = "1"
@@ -40,6 +42,11 @@ try:
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
+try:
+    from dragonfly_grasshopper.epwfile import epw_columns, write_epw_columns
+except ImportError as e:
+    raise ImportError('\nFailed to import dragonfly_grasshopper:\n\t{}'.format(e))
+
 try:
     from ladybug_rhino.grasshopper import all_required_inputs
 except ImportError as e:
@@ -55,5 +62,8 @@ if all_required_inputs(ghenv.Component) and _run:
     _file_name_ = _epw_obj.location.city if _file_name_ is None else _file_name_
     if not _file_name_.endswith('.epw'):
         _file_name_ = _file_name_ + '.epw'
-    epw_file = os.path.join(_folder_, _file_name_)
-    _epw_obj.save(epw_file)
\ No newline at end of file
+    if compress_:
+        _file_name_ = _file_name_ + '.gz'
+    header, columns = epw_columns(_epw_obj)
+    epw_file = write_epw_columns(
+        os.path.join(_folder_, _file_name_), header, columns, compress_)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Translate the Buildings of a Dragonfly Model several at a time.
+
+The functions produce the same Honeybee Models and URBANopt files as the
+Model.to_honeybee, Model.to_geojson_dict and Model.to.urbanopt methods of
+dragonfly but they find the context shade of each Building with a spatial
+grid, translate several Buildings at once and write the geoJSON one Building
+feature at a time.
+"""
+import os
+import json
+
+from ladybug.futil import nukedir, preparedir
+from honeybee.config import folders
+from honeybee.model import Model as hb_model
+from dragonfly.model import Model
+
+from .spatial import bound_points, spatial_grid, objects_in_dist
+from .parallel import run_in_parallel
+
+
+def buildings_to_honeybee(model, shade_distance=None, use_multiplier=True,
+                          add_plenum=False, tolerance=0.01, cpus=None):
+    """Translate each Building of a Model to a Honeybee Model with context shade.
+
+    The Models are identical to those of model.to_honeybee('Building').
+
+    Args:
+        model: A Dragonfly Model.
+        shade_distance: An optional number to note the distance beyond which other
+            objects' shade should not be exported into a given Model. If None,
+            all other buildings will be included as context shade in each and
+            every Model. Set to 0 to exclude all neighboring buildings from the
+            resulting models. (Default: None).
+        use_multiplier: If True, the multipliers on the Model's Stories will be
+            passed along to the generated Honeybee Room objects. (Default: True).
+        add_plenum: Boolean to indicate whether ceiling/floor plenums should
+            be auto-generated for the Rooms. (Default: False).
+        tolerance: The minimum distance between points at which they are
+            not considered touching. (Default: 0.01, suitable for objects
+            in meters).
+        cpus: An optional integer for the number of Buildings to translate at
+            once. (Default: None).
+
+    Returns:
+        A list of Honeybee Models with one Model for each Building.
+    """
+    # get the shade representation of all buildings and context shades
+    buildings, context_shades = model.buildings, model.context_shades
+    bldg_count = len(buildings)
+    shades = [None] * bldg_count + [con.to_honeybee() for con in context_shades]
+    if shade_distance is None or shade_distance > 0:
+        def shade_representation(i):
+            shades[i] = buildings[i].shade_representation(tolerance)
+        run_in_parallel(shade_representation, bldg_count, cpus)
+
+    # index the buildings and context shades to find those within the shade_distance
+    obj_pts = [bound_points(obj) for obj in buildings + context_shades]
+    if shade_distance is not None and shade_distance > 0:
+        grid = spatial_grid(obj_pts, shade_distance)
+
+    # translate each Building to a honeybee Model
+    models = [None] * bldg_count
+
+    def translate_building(i):
+        bldg_model = buildings[i].to_honeybee(
+            use_multiplier, add_plenum=add_plenum, tolerance=tolerance)
+        if shade_distance is None:  # add all other buildings and context shades
+            near = [j for j in range(len(obj_pts)) if j != i]
+        elif shade_distance > 0:  # add only those within the distance
+            near = objects_in_dist(grid, obj_pts, i, shade_distance)
+        else:
+            near = []
+        # add the buildings after this one, the ones before it and then the context
+        for j in sorted(near, key=lambda j: (j >= bldg_count, j < i, j)):
+            for shd in shades[j]:
+                bldg_model.add_shade(shd)
+        bldg_model.units = model.units
+        bldg_model.tolerance = tolerance
+        bldg_model.angle_tolerance = model.angle_tolerance
+        bldg_model._properties = model.properties.to_honeybee(bldg_model)
+        models[i] = bldg_model
+
+    run_in_parallel(translate_building, bldg_count, cpus)
+    return models
+
+
+def geojson_features(model, location, point, tolerance, hb_model_folder=None):
+    """Generate the geoJSON feature dictionaries of a Model's Buildings one at a time.
+
+    The features are those of model.to_geojson_dict but only one Building is
+    converted to meters at a time such that memory does not grow with the size
+    of the Model.
+
+    Args:
+        model: A Dragonfly Model.
+        location: A ladybug Location object possessing longitude and latitude data.
+        point: A Point2D for where the location object exists within the Model.
+        tolerance: The minimum distance between points at which they are
+            not considered touching.
+        hb_model_folder: An optional folder of honeybee Model JSONs to be
+            referenced with the detailed_model_filename key of each feature.
+    """
+    conversion_factor = hb_model.conversion_factor_to_meters(model.units)
+    if model.units != 'Meters':
+        point = point.scale(conversion_factor)
+    for bldg in model.buildings:
+        if model.units != 'Meters':  # convert a copy of the building to meters
+            bldg = bldg.duplicate()
+            bldg.scale(conversion_factor)
+        bldg_model = Model(model.identifier, [bldg])
+        geojson_dict = bldg_model.to_geojson_dict(location, point, tolerance)
+        feature_dict = geojson_dict['features'][0]
+        if hb_model_folder is not None:
+            feature_dict['properties']['detailed_model_filename'] = \
+                os.path.join(hb_model_folder, '{}.json'.format(bldg.identifier))
+        yield feature_dict
+
+
+def write_geojson(model, location, point, file_path, tolerance, hb_model_folder=None,
+                  ndjson=False):
+    """Write a geoJSON of a Model's Buildings to a file one feature at a time.
+
+    Args:
+        model: A Dragonfly Model.
+        location: A ladybug Location object possessing longitude and latitude data.
+        point: A Point2D for where the location object exists within the Model.
+        file_path: The path to the file to be written.
+        tolerance: The minimum distance between points at which they are
+            not considered touching.
+        hb_model_folder: An optional folder of honeybee Model JSONs to be
+            referenced with the detailed_model_filename key of each feature.
+        ndjson: Boolean to note whether the file should be a newline-delimited
+            geoJSON with one Building feature on each line instead of a
+            FeatureCollection. (Default: False).
+
+    Returns:
+        The path to the written file.
+    """
+    features = geojson_features(model, location, point, tolerance, hb_model_folder)
+    with open(file_path, 'w') as fp:
+        if ndjson:
+            for feature_dict in features:
+                fp.write(json.dumps(feature_dict) + '\n')
+            return file_path
+
+        # write the FeatureCollection of a Model without Buildings around the features
+        # using the json.dump arguments of Model.to_geojson so that the separators
+        # and indentation between the features are those of the interpreter
+        base_model = Model(model.identifier)
+        base_model.display_name = model.display_name
+        base_dict = base_model.to_geojson_dict(location)
+        base_dict['features'] = ['FEATURES', 'FEATURES']
+        start, between, end = json.dumps(base_dict, indent=4).split('"FEATURES"')
+        indent = between[between.index('\n'):]
+        fp.write(start.rstrip())
+        count = 0
+        for feature_dict in features:
+            feature = json.dumps(feature_dict, indent=4)
+            fp.write((indent if count == 0 else between) +
+                     feature.replace('\n', indent))
+            count += 1
+        fp.write(end if count != 0 else end.lstrip())
+    return file_path
+
+
+def model_to_urbanopt(model, location, point, shade_distance=None, use_multiplier=True,
+                      add_plenum=False, folder=None, tolerance=0.01, cpus=None):
+    """Write an URBANopt geoJSON and honeybee Model JSONs, several Buildings at a time.
+
+    The arguments and the files written are the same as those of the
+    model_to_urbanopt function of dragonfly_energy.writer (aka. model.to.urbanopt)
+    with the addition of the cpus argument.
+
+    Returns:
+        A tuple with the path to the geoJSON, a list of paths to the honeybee
+        Model JSONs and a list of the honeybee Models.
+    """
+    # make sure the model is in meters and, if it's not, duplicate and scale it
+    if model.units != 'Meters':
+        units = model.units
+        conversion_factor = hb_model.conversion_factor_to_meters(units)
+        point = point.scale(conversion_factor)
+        if shade_distance is not None:
+            shade_distance = shade_distance * conversion_factor
+        model = model.duplicate()  # duplicate the model to avoid mutating the input
+        model.units = units  # the duplicate does not keep the units of the original
+        model.convert_to_units('Meters')
+
+    # prepare the folder for simulation
+    if folder is None:  # use the default simulation folder
+        folder = os.path.join(folders.default_simulation_folder, model.identifier)
+    nukedir(folder, True)  # get rid of anything that exists in the folder already
+    preparedir(folder)  # create the directory if it's not there
+    hb_model_folder = os.path.join(folder, 'hb_json')  # folder for honeybee JSONs
+    preparedir(hb_model_folder)
+
+    # write out the geoJSON file from the model
+    feature_geojson = os.path.join(folder, '{}.geojson'.format(model.identifier))
+    write_geojson(model, location, point, feature_geojson, tolerance, hb_model_folder)
+
+    # translate each Building to a honeybee Model and write it to a JSON
+    hb_models = buildings_to_honeybee(
+        model, shade_distance, use_multiplier, add_plenum, tolerance, cpus)
+    hb_model_jsons = [
+        os.path.join(hb_model_folder, '{}.json'.format(bldg_model.identifier))
+        for bldg_model in hb_models]
+
+    def write_model(i):
+        with open(hb_model_jsons[i], 'w') as fp:
+            json.dump(hb_models[i].to_dict(triangulate_sub_faces=True), fp)
+
+    run_in_parallel(write_model, len(hb_models), cpus)
+    return feature_geojson, hb_model_jsons, hb_models
@@ -0,0 +1,197 @@
+"""Run URBANopt simulations in the background and collect the results of each feature.
+
+A simulation is started with start_urbanopt, which returns a job dictionary that
+can be checked with poll and whose result files are returned by collect. None of
+these functions need Rhino or Grasshopper. In Python 3, the collect_async
+coroutine waits for a job without blocking the event loop.
+"""
+import os
+import csv
+import sys
+import time
+import shutil
+import subprocess
+
+from ladybug.futil import write_to_file
+from dragonfly_energy.config import folders
+
+
+# the result files of each feature in the order of the component outputs
+RESULT_FILES = ('in.osm', 'in.idf', 'eplusout.sql', 'epluszsz.csv', 'eplusout.rdd',
+                'eplustbl.htm', 'eplusout.err')
+
+
+def feature_folder(directory, feature_id):
+    """Get the run folder of a feature in an URBANopt project folder."""
+    return os.path.join(directory, 'run', 'honeybee_scenario', feature_id)
+
+
+def feature_status(directory, feature_id):
+    """Get the status of the simulation of a feature in an URBANopt project folder.
+
+    Returns:
+        Text for the status, which is either 'finished', 'failed', 'running'
+        or 'queued'.
+    """
+    feature_dir = feature_folder(directory, feature_id)
+    if os.path.isfile(os.path.join(feature_dir, 'finished.job')):
+        return 'finished'
+    if os.path.isfile(os.path.join(feature_dir, 'failed.job')):
+        return 'failed'
+    if os.path.isfile(os.path.join(feature_dir, 'started.job')):
+        return 'running'
+    return 'queued'
+
+
+def feature_results(directory, feature_ids):
+    """Get the simulation result files of features in an URBANopt project folder.
+
+    Returns:
+        A list with the osm, idf, sql, zsz, rdd, html and err files of the
+        features, in the order of feature_ids and only for the files that exist.
+    """
+    results = [[] for _ in RESULT_FILES]
+    for feature_id in feature_ids:
+        feature_dir = feature_folder(directory, feature_id)
+        for result, f_name in zip(results, RESULT_FILES):
+            result_file = os.path.join(feature_dir, f_name)
+            if os.path.isfile(result_file):
+                result.append(result_file)
+    return results
+
+
+def clear_feature(directory, feature_id):
+    """Remove all results of a previous run of a feature before it is simulated again."""
+    feature_dir = feature_folder(directory, feature_id)
+    if os.path.isdir(feature_dir):
+        shutil.rmtree(feature_dir)
+
+
+def scenario_features(scenario):
+    """Get the header and the rows of the features in an URBANopt scenario .csv file."""
+    with open(scenario) as csv_file:
+        rows = [row for row in csv.reader(csv_file) if row]
+    return rows[0], rows[1:]
+
+
+def write_scenario(scenario, header, rows):
+    """Rewrite an URBANopt scenario .csv file to only have certain features."""
+    with open(scenario, 'w') as csv_file:
+        csv.writer(csv_file, lineterminator='\n').writerows([header] + rows)
+
+
+def urbanopt_script(feature_geojson, scenario_csv):
+    """Write the script that runs a feature and scenario file through URBANopt CLI.
+
+    Returns:
+        The path to the .bat file (on Windows) or the executable .sh file (on
+        other systems), which is written next to the feature_geojson.
+    """
+    if not folders.urbanopt_env_path:
+        folders.generate_urbanopt_env_path()
+    assert folders.urbanopt_env_path, \
+        'No URBANopt installation was found in dragonfly_energy.config.folders.'
+    directory = os.path.dirname(feature_geojson)
+
+    # these are the scripts of _run_urbanopt_windows and _run_urbanopt_unix in
+    # dragonfly_energy.run, which cannot be used here since they also run the
+    # script and wait for the simulation to finish
+    if os.name == 'nt':  # we are on Windows
+        working_drive = directory[:2]
+        script = '{}\ncd {}\ncall {}\nuo run -f {} -s {}'.format(
+            working_drive, working_drive, folders.urbanopt_env_path,
+            feature_geojson, scenario_csv)
+        script_file = os.path.join(directory, 'run_simulation.bat')
+        write_to_file(script_file, script, True)
+    else:  # we are on Mac, Linux, or some other unix-based system
+        script = '#!/usr/bin/env bash\nsource {}\nuo -r -f {} -s {}'.format(
+            folders.urbanopt_env_path, feature_geojson, scenario_csv)
+        script_file = os.path.join(directory, 'run_simulation.sh')
+        write_to_file(script_file, script, True)
+        subprocess.check_call(['chmod', 'u+x', script_file])
+    return script_file
+
+
+def start_urbanopt(feature_geojson, scenario_csv, features=None):
+    """Start a simulation with URBANopt CLI as a background process.
+
+    Args:
+        feature_geojson: The full path to a .geojson file containing the
+            footprints of buildings to be simulated.
+        scenario_csv: The full path to a .csv file for the URBANopt scenario.
+            All features in this file are simulated.
+        features: An optional list of (feature ID, name) tuples for all of
+            the features to be reported by the job, which can include features
+            that are not simulated. If None, the features of the scenario_csv
+            will be used. (Default: None).
+
+    Returns:
+        A job dictionary to be used with poll and collect. The URBANopt CLI
+        prints everything to a run_simulation.log file in the project folder.
+    """
+    script_file = urbanopt_script(feature_geojson, scenario_csv)
+    directory = os.path.dirname(feature_geojson)
+    rows = scenario_features(scenario_csv)[1]
+    if features is None:
+        features = [(row[0], row[1] if len(row) > 1 else row[0]) for row in rows]
+    with open(os.path.join(directory, 'run_simulation.log'), 'w') as log_file:
+        process = subprocess.Popen([script_file], cwd=directory, stdout=log_file,
+                                   stderr=subprocess.STDOUT)
+    return {'process': process, 'directory': directory, 'features': features,
+            'pending': set(row[0] for row in rows), 'status': {},
+            'started': {}, 'ended': {}}
+
+
+def poll(job):
+    """Check a simulation started with start_urbanopt and update its feature statuses.
+
+    The status of each feature is recorded under the 'status' key of the job
+    along with the times at which each simulated feature was first seen
+    running and done such that the elapsed times persist between checks.
+
+    Returns:
+        None while the simulation is running and the exit code of the URBANopt
+        CLI once it is done, the same as subprocess.Popen.poll.
+    """
+    exit_code = job['process'].poll()
+    now = time.time()
+    for feature_id, _ in job['features']:
+        status = feature_status(job['directory'], feature_id)
+        job['status'][feature_id] = status
+        if feature_id in job['pending'] and status != 'queued':
+            job['started'].setdefault(feature_id, now)
+            if status != 'running':
+                job['ended'].setdefault(feature_id, now)
+    return exit_code
+
+
+def progress(job):
+    """Get a line of text with the last polled status of each feature of a job.
+
+    The lines of the simulated features include their elapsed time in minutes.
+    """
+    now, lines = time.time(), []
+    for feature_id, name in job['features']:
+        status = job['status'].get(feature_id, 'queued')
+        line = '{} ({}): {}'.format(name, feature_id, status)
+        if feature_id in job['started']:
+            elapsed = job['ended'].get(feature_id, now) - job['started'][feature_id]
+            line = '{} [{:.1f} min]'.format(line, elapsed / 60.)
+        lines.append(line)
+    return lines
+
+
+def collect(job):
+    """Wait for a simulation started with start_urbanopt and get its result files.
+
+    Returns:
+        A list with the osm, idf, sql, zsz, rdd, html and err files of all
+        features of the job, as in feature_results.
+    """
+    job['process'].wait()
+    poll(job)
+    return feature_results(job['directory'], [feature[0] for feature in job['features']])
+
+
+if sys.version_info >= (3, 5):  # coroutines cannot be parsed by IronPython
+    from .urbanopt_async import collect_async  # noqa: F401
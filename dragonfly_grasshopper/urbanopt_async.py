@@ -0,0 +1,27 @@
+"""Wait for URBANopt simulations with asyncio.
+
+This module uses the async syntax of Python 3 and it is only imported by the
+urbanopt module when running in Python 3.5 or above.
+"""
+import asyncio
+
+from .urbanopt import poll, collect
+
+
+async def collect_async(job, interval=5):
+    """Wait for a simulation started with start_urbanopt and get its result files.
+
+    The job is polled every few seconds and other tasks of the event loop run
+    in between the checks.
+
+    Args:
+        job: A job dictionary returned by start_urbanopt.
+        interval: The number of seconds between checks of the job. (Default: 5).
+
+    Returns:
+        A list with the osm, idf, sql, zsz, rdd, html and err files of all
+        features of the job, as in feature_results.
+    """
+    while poll(job) is None:
+        await asyncio.sleep(interval)
+    return collect(job)
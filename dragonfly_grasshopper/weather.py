@@ -0,0 +1,127 @@
+"""Weather calculations evaluated over whole lists of values at once.
+
+The functions give the same results as the ladybug Sunpath, skymodel and
+psychrometrics for each item of the lists but they evaluate each step of the
+equations for all items together instead of creating an object per item.
+"""
+import math
+
+from ladybug.psychrometrics import rel_humid_from_db_dpt
+
+EPW_FIELD_COUNT = 35  # number of data fields on each line of an EPW file
+
+
+def solar_altitudes(location, moys, is_leap_year):
+    """Get the solar altitude in degrees for a list of minutes of the year.
+
+    This uses the same NOAA equations as the ladybug Sunpath (including the
+    correction for atmospheric refraction) but evaluates each step of them for
+    all times at once instead of creating a Sun for each time.
+
+    Args:
+        location: A Ladybug Location object.
+        moys: A list of integers for the minutes of the year.
+        is_leap_year: Boolean to note whether the year is a leap year.
+    """
+    # get the latitude and time of each minute of the year as Sunpath does
+    lat = math.radians(location.latitude)
+    lat = max(min(lat, math.pi / 2 - 1e-9), -math.pi / 2 + 1e-9)
+    time_zone = float(location.time_zone)
+    days_1900 = 42368 if is_leap_year else 42734  # days before 2016 or 2017
+    jul_cents = [((days_1900 + moy // 1440 + 2 + 2415018.5 +
+                   round((moy % 1440) / 1440.0, 2) - time_zone / 24) - 2451545) / 36525
+                 for moy in moys]
+
+    # compute the solar declination and the equation of time
+    mean_longs = [math.radians((280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360)
+                  for jc in jul_cents]
+    mean_anoms = [math.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+                  for jc in jul_cents]
+    eccents = [0.016708634 - jc * (0.000042037 + 0.0000001267 * jc) for jc in jul_cents]
+    omegas = [math.radians(125.04 - 1934.136 * jc) for jc in jul_cents]
+    app_longs = [math.radians(
+        math.degrees(ml) + math.sin(ma) * (1.914602 - jc * (0.004817 + 0.000014 * jc)) +
+        math.sin(2 * ma) * (0.019993 - 0.000101 * jc) + math.sin(3 * ma) * 0.000289 -
+        0.00569 - 0.00478 * math.sin(om))
+        for jc, ml, ma, om in zip(jul_cents, mean_longs, mean_anoms, omegas)]
+    obliq_corrs = [math.radians(23 + (26 + ((21.448 - jc * (46.815 + jc * (
+        0.00059 - jc * 0.001813)))) / 60) / 60 + 0.00256 * math.cos(om))
+        for jc, om in zip(jul_cents, omegas)]
+    sol_decs = [math.asin(math.sin(oc) * math.sin(al))
+                for oc, al in zip(obliq_corrs, app_longs)]
+    var_ys = [math.tan(oc / 2) ** 2 for oc in obliq_corrs]
+    eqs_of_time = [4 * math.degrees(
+        vy * math.sin(2 * ml) - 2 * ec * math.sin(ma) +
+        4 * ec * vy * math.sin(ma) * math.cos(2 * ml) -
+        0.5 * vy ** 2 * math.sin(4 * ml) - 1.25 * ec ** 2 * math.sin(2 * ma))
+        for vy, ml, ma, ec in zip(var_ys, mean_longs, mean_anoms, eccents)]
+
+    # compute the hour angles and the altitudes
+    lon_mins = 4 * location.longitude - 60 * time_zone
+    sol_times = [((moy % 1440) + eq + lon_mins) % 1440
+                 for moy, eq in zip(moys, eqs_of_time)]
+    hour_angles = [math.radians(st / 4 + 180 if st < 0 else st / 4 - 180)
+                   for st in sol_times]
+    altitudes = [90 - math.degrees(math.acos(
+        math.sin(lat) * math.sin(sd) + math.cos(lat) * math.cos(sd) * math.cos(ha)))
+        for sd, ha in zip(sol_decs, hour_angles)]
+
+    # correct the altitudes for atmospheric refraction
+    for i, alt in enumerate(altitudes):
+        if alt > 85:
+            continue
+        elif alt > 5:
+            tan_alt = math.tan(math.radians(alt))
+            refract = 58.1 / tan_alt - 0.07 / tan_alt ** 3 + 0.000086 / tan_alt ** 5
+        elif alt > -0.575:
+            refract = 1735 + alt * \
+                (-518.2 + alt * (103.4 + alt * (-12.79 + alt * 0.711)))
+        else:
+            refract = -20.772 / math.tan(math.radians(alt))
+        altitudes[i] = alt + refract / 3600
+    return altitudes
+
+
+SIGMA = 5.6697e-8  # stefan-boltzmann constant
+
+
+def sky_emissivities(sky_cover, dew_point):
+    """Get the sky emissivity for aligned lists of sky cover and dew point.
+
+    The cloud term of the emissivity is only computed once for each distinct
+    sky cover value, which usually has no more than 11 values.
+
+    Args:
+        sky_cover: A list of numbers for the opaque sky cover [tenths].
+        dew_point: A list of numbers for the dew point temperature [C].
+    """
+    cloud_terms = {}
+    for cover in set(sky_cover):
+        cloud_terms[cover] = \
+            1 + (0.022 * cover) - (0.0035 * (cover ** 2)) + (0.00028 * (cover ** 3))
+    return [(0.787 + (0.764 * math.log((dp + 273.15) / 273.15))) * cloud_terms[cover]
+            for cover, dp in zip(sky_cover, dew_point)]
+
+
+def horizontal_infrared(sky_emissivity, dry_bulb):
+    """Get the horizontal infrared radiation intensity [W/m2] for aligned lists.
+
+    The values are the same as those of calc_horizontal_infrared in the
+    ladybug skymodel.
+
+    Args:
+        sky_emissivity: A list of numbers for the sky emissivity, such as those
+            from the sky_emissivities function.
+        dry_bulb: A list of numbers for the dry bulb temperature [C].
+    """
+    return [emiss * SIGMA * ((db + 273.15) ** 4)
+            for emiss, db in zip(sky_emissivity, dry_bulb)]
+
+
+def relative_humidities(dry_bulb, dew_point):
+    """Get the relative humidity [%] for aligned lists of dry bulb and dew point [C].
+
+    The values are the same as those of rel_humid_from_db_dpt in the ladybug
+    psychrometrics.
+    """
+    return [rel_humid_from_db_dpt(db, dp) for db, dp in zip(dry_bulb, dew_point)]